@@ -0,0 +1,93 @@
+"""Throughput benchmark for the compiled fallback template engine.
+
+Renders a fixed set of varied social and ad requests (all platforms and
+tones, with and without optional fields) and reports renders per second for
+one-at-a-time and many-per-call rendering. For ads it also times plain
+``str.format`` on the same templates, to show what compiling them saves.
+
+Usage:
+    python -m benchmarks.fallback_templates [--requests 2000] [--seconds 2]
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from src.content_creation.components.fallback_templates import (
+    AD_TEMPLATES,
+    DEFAULT_AD_TEMPLATE,
+    HASHTAG_TEMPLATES,
+    TONE_EMOJIS,
+    join_features,
+    render_ad,
+    render_ads_many,
+    render_social,
+    render_social_many,
+)
+
+
+def make_requests(count: int, seed: int = 0):
+    rnd = random.Random(seed)
+    platforms = list(HASHTAG_TEMPLATES) + ["other"]
+    tones = list(TONE_EMOJIS) + ["casual"]
+
+    def maybe(value):
+        return value if rnd.random() < 0.7 else None
+
+    social = [
+        SimpleNamespace(
+            platform=rnd.choice(platforms),
+            tone=rnd.choice(tones),
+            product_name=maybe(f"Product {i}"),
+            product_category=maybe(f"Category {i % 7}"),
+            key_features=[f"Feature {j}" for j in range(rnd.randint(0, 5))] or None,
+            special_features=maybe("Ships in recycled packaging"),
+            target_audience=maybe("busy parents"),
+            include_hashtags=rnd.random() < 0.8,
+            include_emojis=rnd.random() < 0.8,
+        )
+        for i in range(count)
+    ]
+    ads = [
+        (f"Brand {i}", f"Product {i}", "runners", [f"feature {j}" for j in range(rnd.randint(1, 5))], rnd.choice(list(AD_TEMPLATES) + ["other"]))
+        for i in range(count)
+    ]
+    return social, ads
+
+
+def format_ad(brand_name, product_name, target_audience, key_features, tone):
+    template = AD_TEMPLATES.get(tone.lower(), DEFAULT_AD_TEMPLATE)
+    return template.format(brand_name=brand_name, product_name=product_name, target_audience=target_audience, features=join_features(key_features))
+
+
+def rate(fn, count: int, seconds: float) -> float:
+    """Call ``fn`` (which renders ``count`` items) repeatedly for ``seconds``; return renders/s."""
+    fn()  # Warm up
+    rendered = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        fn()
+        rendered += count
+    return rendered / (time.perf_counter() - started)
+
+
+def main(count: int, seconds: float):
+    social, ads = make_requests(count)
+    results = [
+        ("social, one per call", lambda: [render_social(request) for request in social]),
+        ("social, many per call", lambda: render_social_many(social)),
+        ("ad, one per call", lambda: [render_ad(*brief) for brief in ads]),
+        ("ad, many per call", lambda: render_ads_many(ads)),
+        ("ad, str.format", lambda: [format_ad(*brief) for brief in ads]),
+    ]
+    print(f"{'case':<24} {'renders/s':>12}")
+    for name, fn in results:
+        print(f"{name:<24} {rate(fn, count, seconds):>12,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    main(args.requests, args.seconds)
@@ -0,0 +1,67 @@
+"""Concurrency benchmark for the async generation layer.
+
+Runs a fixed number of generations against a stub model that sleeps like a
+slow Gemini call, at increasing in-flight levels, and reports throughput.
+
+Usage:
+    python -m benchmarks.generation_concurrency [--latency 0.2] [--requests 128]
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+# Measure the generation layer itself, not the Gemini rate limiter (benchmarked separately)
+os.environ.setdefault("GEMINI_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("GEMINI_TOKENS_PER_MINUTE", "0")
+
+from src.content_creation.utils.generation import generate_content, shutdown_executor
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Blocking stand-in for ``genai.GenerativeModel``."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, prompt: str, **kwargs: Any) -> StubResponse:
+        time.sleep(self.latency)
+        return StubResponse(f"generated: {prompt}")
+
+
+async def run_level(model: StubModel, total: int, in_flight: int) -> float:
+    semaphore = asyncio.Semaphore(in_flight)
+
+    async def one(i: int):
+        async with semaphore:
+            await generate_content(model, f"prompt {i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+async def main(latency: float, total: int, levels: list[int]):
+    model = StubModel(latency)
+    print(f"stub latency={latency:.3f}s requests={total}")
+    print(f"{'in-flight':>10} {'seconds':>10} {'req/s':>10}")
+    for level in levels:
+        elapsed = await run_level(model, total, level)
+        print(f"{level:>10} {elapsed:>10.2f} {total / elapsed:>10.1f}")
+    shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 32, 64])
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.requests, args.levels))
@@ -0,0 +1,97 @@
+"""Memory benchmark: buffered vs streaming decoding of Stability image responses.
+
+Serves a Stability-style JSON body (one base64 artifact) from an in-process
+httpx transport that generates it on the fly, then saves the image with
+
+* buffered: ``response.json()`` + ``base64.b64decode`` + one ``write``
+  (the previous implementation), and
+* streaming: ``utils.image_stream.stream_image_to_file``.
+
+Peak Python heap allocations are measured with tracemalloc for several image
+sizes. The streaming peak should stay flat as the image grows.
+
+Usage:
+    python -m benchmarks.image_decode_memory [--sizes 1 4 16]
+"""
+import argparse
+import asyncio
+import base64
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+import httpx
+
+from src.content_creation.utils.image_stream import stream_image_to_file
+
+RAW_CHUNK = 48 * 1024  # Multiple of 3, so per-chunk base64 concatenates cleanly
+
+
+class GeneratedBody(httpx.AsyncByteStream):
+    """Yields a JSON artifact body for ``size`` random image bytes without holding it."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    async def __aiter__(self):
+        yield b'{"artifacts": [{"base64": "'
+        remaining = self.size
+        while remaining > 0:
+            chunk = os.urandom(min(RAW_CHUNK, remaining))
+            remaining -= len(chunk)
+            yield base64.b64encode(chunk)
+        yield b'", "seed": 1, "finishReason": "SUCCESS"}]}'
+
+
+def make_client(size: int) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, stream=GeneratedBody(size))
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def buffered(client: httpx.AsyncClient, directory: Path) -> None:
+    response = await client.post("https://stability.test/generate")
+    image_data = base64.b64decode(response.json()["artifacts"][0]["base64"])
+    with open(directory / "buffered.png", "wb") as f:
+        f.write(image_data)
+
+
+async def streaming(client: httpx.AsyncClient, directory: Path) -> None:
+    request = client.build_request("POST", "https://stability.test/generate")
+    response = await client.send(request, stream=True)
+    try:
+        tmp_path = await stream_image_to_file(response, directory / "streaming.tmp")
+    finally:
+        await response.aclose()
+    os.replace(tmp_path, directory / "streaming.png")
+
+
+async def measure(fn, size: int, directory: Path) -> int:
+    async with make_client(size) as client:
+        tracemalloc.start()
+        await fn(client, directory)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak
+
+
+async def main(sizes_mb: list[int]):
+    print(f"{'image MB':>9} {'buffered peak MB':>17} {'streaming peak MB':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for size_mb in sizes_mb:
+            size = size_mb * 1024 * 1024
+            buffered_peak = await measure(buffered, size, directory)
+            streaming_peak = await measure(streaming, size, directory)
+            print(f"{size_mb:>9} {buffered_peak / 2**20:>17.1f} {streaming_peak / 2**20:>18.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
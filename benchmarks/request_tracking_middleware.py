@@ -0,0 +1,109 @@
+"""Microbenchmark: pure-ASGI RequestTrackingMiddleware vs the BaseHTTPMiddleware version.
+
+Drives a trivial route in-process through the ASGI interface (no sockets)
+and reports requests/sec for each middleware.
+
+Usage:
+    python -m benchmarks.request_tracking_middleware [--requests 5000] [--with-logging]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.content_creation.middleware.request_tracking import RequestTrackingMiddleware
+
+logger = logging.getLogger("benchmark.legacy_request_tracking")
+
+
+class LegacyRequestTrackingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request.state.request_id = request_id
+        logger.info(
+            "Request started",
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "url": str(request.url),
+                "client_host": request.client.host if request.client else None
+            }
+        )
+        try:
+            response = await call_next(request)
+            logger.info("Request completed", extra={"request_id": request_id, "status_code": response.status_code})
+            response.headers["X-Request-ID"] = request_id
+            return response
+        except Exception as e:
+            logger.error("Request failed", extra={"request_id": request_id, "error": str(e)})
+            raise
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping(request: Request):
+        return {"request_id": request.state.request_id}
+
+    app.add_middleware(middleware)
+    return app
+
+
+async def drive(app, total: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(total):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+async def main(total: int):
+    for name, middleware in (("BaseHTTPMiddleware", LegacyRequestTrackingMiddleware), ("pure ASGI", RequestTrackingMiddleware)):
+        app = build_app(middleware)
+        await drive(app, min(total, 200))  # warm up
+        elapsed = await drive(app, total)
+        print(f"{name:>20}: {total / elapsed:>9.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--with-logging", action="store_true", help="Emit the INFO request logs to a null handler")
+    args = parser.parse_args()
+    root = logging.getLogger()
+    if args.with_logging:
+        root.addHandler(logging.NullHandler())
+        root.setLevel(logging.INFO)
+    else:
+        root.setLevel(logging.WARNING)
+    asyncio.run(main(args.requests))
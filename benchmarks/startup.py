@@ -0,0 +1,88 @@
+"""Cold-start benchmark: app import time and time to first request.
+
+Each run starts a fresh interpreter, imports ``src.content_creation.main``,
+runs the lifespan and sends a first status request and a first generation
+request. Gemini calls are answered by a stub (installed right after the SDK
+is lazily imported, so its import and configure cost still count); nothing
+goes to the network.
+
+Usage:
+    python -m benchmarks.startup [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+from src.content_creation.main import app
+t_import = time.perf_counter()
+genai_at_import = "google.generativeai" in sys.modules
+pil_at_import = "PIL" in sys.modules
+
+from src.content_creation.utils.clients import ClientRegistry
+
+_genai = ClientRegistry.genai
+
+class _Response:
+    text = "stub ad copy"
+
+def _genai_with_stub(self):
+    module = _genai(self)
+    module.GenerativeModel.generate_content = lambda model, prompt, **kwargs: _Response()
+    return module
+
+ClientRegistry.genai = _genai_with_stub
+
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    t_started = time.perf_counter()
+    client.get("/api/status/cache")
+    t_status = time.perf_counter()
+    client.post("/api/generate_ad", json={
+        "brand_name": "Acme", "product_name": "Rocket", "target_audience": "coyotes",
+        "key_features": ["fast"], "tone": "friendly",
+    })
+    t_generate = time.perf_counter()
+
+print(json.dumps({
+    "import": t_import - t0,
+    "lifespan": t_started - t_import,
+    "first_status": t_status - t0,
+    "first_generation": t_generate - t0,
+    "genai_at_import": genai_at_import,
+    "pil_at_import": pil_at_import,
+}))
+"""
+
+
+def run_once() -> dict:
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env.setdefault("TRACE_ENABLED", "false")
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int):
+    samples = [run_once() for _ in range(runs)]
+    print(f"runs={runs} (median, seconds from interpreter start of the import)")
+    for key in ("import", "lifespan", "first_status", "first_generation"):
+        print(f"{key:>18}: {statistics.median(sample[key] for sample in samples):.3f}")
+    print(f"{'genai at import':>18}: {samples[0]['genai_at_import']}")
+    print(f"{'PIL at import':>18}: {samples[0]['pil_at_import']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from src.content_creation.config.settings import settings
+from src.content_creation.utils.logging import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+async def bulk(args: argparse.Namespace) -> int:
+    # Imported here so `--help` doesn't load the routers and their SDKs
+    from src.content_creation.pipeline.bulk_generation import run_bulk
+    from src.content_creation.utils.clients import clients
+    from src.content_creation.utils.generation import shutdown_executor
+    from src.content_creation.utils.render_pool import shutdown_render_pool
+
+    clients.start()
+    try:
+        counts = await run_bulk(
+            Path(args.input),
+            Path(args.output),
+            args.kind,
+            concurrency=args.concurrency,
+            offline=args.offline,
+            checkpoint_path=Path(args.checkpoint) if args.checkpoint else None,
+            checkpoint_every=args.checkpoint_every,
+        )
+    finally:
+        await clients.aclose()
+        shutdown_executor()
+        shutdown_render_pool()
+    return 1 if counts["failed"] else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.content_creation.cli", description="Content creation command line tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bulk_parser = subparsers.add_parser(
+        "bulk",
+        help="Generate content for every record of a CSV or JSONL file.",
+        description="Stream records from a CSV (header row, ';'-separated key_features) or JSONL file through "
+        "the same generation as the API and append JSONL results. Rerunning the same command resumes "
+        "from the checkpoint after a crash.",
+    )
+    bulk_parser.add_argument("kind", choices=["social", "ad", "video"], help="Which generator each record is for.")
+    bulk_parser.add_argument("input", help="Input .csv or .jsonl file; fields match the API request body.")
+    bulk_parser.add_argument("output", help="Output .jsonl file.")
+    bulk_parser.add_argument("--concurrency", type=positive_int, default=settings.BATCH_MAX_CONCURRENCY, help="Records generated at once (default: %(default)s).")
+    bulk_parser.add_argument("--offline", action="store_true", help="Use the fallback generators without calling any upstream API.")
+    bulk_parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint).")
+    bulk_parser.add_argument("--checkpoint-every", type=positive_int, default=100, help="Records between checkpoints (default: %(default)s).")
+
+    args = parser.parse_args()
+    setup_logging()
+    if args.command == "bulk":
+        return asyncio.run(bulk(args))
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+import string
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Copy templates used when Gemini is unavailable. Everything below is parsed
+# once at import; rendering only fills in request values.
+
+SOCIAL_TEMPLATES = {
+    "instagram": "✨ NEW PRODUCT ALERT! ✨\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
+    "facebook": "🔥 INTRODUCING: {product_name} 🔥\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
+    "twitter": "{intro} {features} {special} {target} {hashtags}",
+    "linkedin": "🚀 Product Announcement 🚀\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
+    "tiktok": "Check out the new {product_name}! 🤩\n{features}\n{special}\n{hashtags}",
+}
+
+# Emoji sets based on tone
+TONE_EMOJIS = {
+    "engaging": ["✨", "🔥", "👀", "🙌", "💯"],
+    "professional": ["📊", "💼", "🚀", "📈", "✅"],
+    "friendly": ["😊", "👋", "🤗", "💕", "👍"],
+    "humorous": ["😂", "🤣", "😜", "🤪", "😎"],
+    "excited": ["🤩", "🎉", "🔥", "💥", "⚡"],
+    "formal": ["📝", "📋", "🔍", "📌", "🔖"],
+}
+
+HASHTAG_TEMPLATES = {
+    "instagram": ["#NewProduct", "#MustHave", "#{product_category}Life", "#{product_name}Launch", "#Innovation"],
+    "facebook": ["#NewProduct", "#{product_category}", "#{product_name}", "#Innovation"],
+    "twitter": ["#New", "#{product_category}", "#{product_name}"],
+    "linkedin": ["#ProductLaunch", "#Innovation", "#{product_category}Industry", "#{product_name}"],
+    "tiktok": ["#fyp", "#{product_category}Check", "#{product_name}Reveal", "#NewProductAlert"],
+}
+
+AD_TEMPLATES = {
+    "professional": "Introducing {product_name} from {brand_name}. Designed specifically for {target_audience}, it offers {features}. Choose quality. Choose {brand_name}.",
+    "friendly": "Hey there! Check out {brand_name}'s new {product_name}! Perfect for {target_audience} like you, it comes with {features}. Give it a try!",
+    "humorous": "Tired of boring products? {brand_name}'s {product_name} is here to save the day! With {features}, it's exactly what {target_audience} have been waiting for. Warning: May cause extreme satisfaction!",
+    "formal": "We are pleased to announce {brand_name}'s latest innovation: {product_name}. Tailored for {target_audience}, it provides {features}. We invite you to experience the difference.",
+    "excited": "WOW! {brand_name} just launched the AMAZING {product_name}! It's PERFECT for {target_audience} and comes with {features}! You'll LOVE it!",
+    "casual": "So, {brand_name} just dropped their new {product_name}. It's pretty cool - made for {target_audience} and has {features}. Worth checking out!",
+}
+DEFAULT_AD_TEMPLATE = "Introducing {product_name} from {brand_name}. Perfect for {target_audience}, featuring {features}."
+
+TWITTER_MAX_LENGTH = 280
+
+_formatter = string.Formatter()
+
+
+def parse_template(template: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a ``str.format`` template into ``(literal, field)`` pairs; only plain field names are allowed."""
+    parts = []
+    for literal, field, format_spec, conversion in _formatter.parse(template):
+        if field is not None and (format_spec or conversion or not field.isidentifier()):
+            raise ValueError(f"Unsupported template field {{{field}}} in {template!r}")
+        parts.append((literal, field))
+    return parts
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    """Compile a ``str.format`` template into a function taking its fields as keyword arguments.
+
+    The template is parsed once into literal and field parts, so rendering
+    only looks up each field and joins the parts. Unused keyword arguments
+    are ignored, so one set of values can render any template of a family.
+    """
+    parts = parse_template(template)
+
+    def render(**values: str) -> str:
+        return "".join([literal if field is None else literal + values[field] for literal, field in parts])
+
+    return render
+
+
+def _compile_hashtag(tag: str) -> Tuple[str, Optional[str], str]:
+    """Return ``(prefix, field, suffix)`` for a hashtag with at most one field."""
+    parts = parse_template(tag)
+    if len(parts) == 1:
+        return parts[0][0], parts[0][1], ""
+    (prefix, field), (suffix, _) = parts
+    return prefix, field, suffix
+
+
+class _ToneStyle:
+    """Emoji decorations for one tone, built once."""
+
+    def __init__(self, emoji_set: Sequence[str]):
+        self.intro_prefix = f"{emoji_set[0]} "
+        self.intro_suffix = f" {emoji_set[1]}"
+        self.special_prefix = f"{emoji_set[2]} "
+        self.target_prefix = f"{emoji_set[3]} "
+        self.feature_bullets = [f"\n- {emoji} " for emoji in emoji_set]
+
+
+_SOCIAL = {platform: compile_template(template) for platform, template in SOCIAL_TEMPLATES.items()}
+_HASHTAGS = {platform: [_compile_hashtag(tag) for tag in tags] for platform, tags in HASHTAG_TEMPLATES.items()}
+_TONES = {tone: _ToneStyle(emoji_set) for tone, emoji_set in TONE_EMOJIS.items()}
+_ADS = {tone: compile_template(template) for tone, template in AD_TEMPLATES.items()}
+_DEFAULT_AD = compile_template(DEFAULT_AD_TEMPLATE)
+
+
+def _render_hashtags(platform: str, values: Dict[str, Optional[str]]) -> str:
+    tags = []
+    for prefix, field, suffix in _HASHTAGS.get(platform, _HASHTAGS["instagram"]):
+        if field is None:
+            tags.append(prefix)
+        elif values[field]:
+            tags.append(prefix + values[field].replace(" ", "") + suffix)
+        # Tags for a field the request doesn't have are left out
+    return " ".join(tags)
+
+
+def render_social(request: Any) -> str:
+    """Render the fallback post for a social content request (any object with its fields)."""
+    platform = request.platform.lower()
+    style = _TONES.get((request.tone or "engaging").lower(), _TONES["engaging"])
+    emojis = request.include_emojis
+
+    product_name = request.product_name or "our new product"
+    intro = f"Introducing {product_name}" + (f", our new {request.product_category}" if request.product_category else "") + "!"
+    if emojis:
+        intro = style.intro_prefix + intro + style.intro_suffix
+
+    features = ""
+    if request.key_features:
+        if emojis:
+            bullets = style.feature_bullets
+            features = "Key Features:" + "".join(bullets[i % len(bullets)] + feature for i, feature in enumerate(request.key_features))
+        else:
+            features = "Key Features:" + "".join("\n-  " + feature for feature in request.key_features)
+
+    special = ""
+    if request.special_features:
+        special = f"Special Features: {request.special_features}"
+        if emojis:
+            special = style.special_prefix + special
+
+    target = ""
+    if request.target_audience:
+        target = f"Perfect for {request.target_audience}!"
+        if emojis:
+            target = style.target_prefix + target
+
+    hashtags = ""
+    if request.include_hashtags:
+        hashtags = _render_hashtags(platform, {"product_name": request.product_name, "product_category": request.product_category})
+
+    content = _SOCIAL.get(platform, _SOCIAL["instagram"])(
+        intro=intro,
+        product_name=product_name,
+        features=features,
+        special=special,
+        target=target,
+        hashtags=hashtags,
+    )
+    if platform == "twitter" and len(content) > TWITTER_MAX_LENGTH:
+        content = content[:TWITTER_MAX_LENGTH - 3] + "..."
+    return content
+
+
+def join_features(key_features: Sequence[str]) -> str:
+    """Join features as "a", "a and b" or "a, b, and c"."""
+    if len(key_features) <= 2:
+        return " and ".join(key_features)
+    return ", ".join(key_features[:-1]) + f", and {key_features[-1]}"
+
+
+def render_ad(brand_name: str, product_name: str, target_audience: str, key_features: Sequence[str], tone: str) -> str:
+    """Render the fallback ad copy for one brief."""
+    return _ADS.get(tone.lower(), _DEFAULT_AD)(
+        brand_name=brand_name,
+        product_name=product_name,
+        target_audience=target_audience,
+        features=join_features(key_features),
+    )
+
+
+def render_social_many(requests: Iterable[Any]) -> List[str]:
+    """Render fallback posts for many requests in one call."""
+    return [render_social(request) for request in requests]
+
+
+def render_ads_many(briefs: Iterable[Tuple[str, str, str, Sequence[str], str]]) -> List[str]:
+    """Render fallback ad copy for many ``(brand_name, product_name, target_audience, key_features, tone)`` briefs."""
+    return [render_ad(*brief) for brief in briefs]
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 class Settings(BaseSettings):
     # API Keys
@@ -13,11 +13,116 @@ class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
     # Generation Settings
+    GEMINI_MODEL_NAME: str = "gemini-pro"
     MAX_VIDEO_DURATION: int = 300  # Maximum video duration in seconds
     MIN_VIDEO_DURATION: int = 10   # Minimum video duration in seconds
+
+    # Concurrency
+    GENERATION_MAX_WORKERS: int = 32  # Maximum in-flight Gemini calls per worker
+    GENERATION_TIMEOUT_SECONDS: float = 60.0  # Per-call Gemini timeout
+    GENERATION_DEADLINE_SECONDS: float = 90.0  # Cap on one Gemini call including its retries
+
+    SOCIAL_TEXT_TIMEOUT_SECONDS: float = 60.0  # Fallback copy is served after this
+    SOCIAL_IMAGE_TIMEOUT_SECONDS: float = 90.0  # The post is returned without an image after this
+
+    BATCH_MAX_CONCURRENCY: int = 8  # Concurrent items per batch request
+    BATCH_MAX_ITEMS: int = 500
+
+    # Upstream HTTP client
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_READ_TIMEOUT_SECONDS: float = 30.0
+
+    # Response cache
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL_SECONDS: float = 3600.0
+    CACHE_BACKEND: str = "memory"  # "memory" or "disk"
+    CACHE_DIR: str = ".cache/responses"
+    CACHE_DISABLED_ENDPOINTS: List[str] = []  # Any of "ads", "social", "video"
+
+    # Upstream rate limits (0 disables a budget)
+    GEMINI_REQUESTS_PER_MINUTE: int = 60
+    GEMINI_TOKENS_PER_MINUTE: int = 120000
+    GEMINI_OUTPUT_TOKENS_ESTIMATE: int = 300  # Output tokens charged per call
+    STABILITY_REQUESTS_PER_MINUTE: int = 900
+    RATE_LIMIT_BURST_SECONDS: float = 5.0  # Bucket capacity, in seconds of budget
+    RATE_LIMIT_INTERACTIVE_DEADLINE_SECONDS: float = 10.0
+    RATE_LIMIT_BULK_DEADLINE_SECONDS: float = 300.0
+    RATE_LIMIT_MIN_FRACTION: float = 0.1  # Floor for the budget after repeated 429s
+    RATE_LIMIT_RECOVERY_SECONDS: float = 60.0
+
+    # Upstream retries
+    RETRY_MAX_ATTEMPTS: int = 3  # Attempts per upstream call, including the first
+    RETRY_BASE_DELAY_SECONDS: float = 0.5
+    RETRY_MAX_DELAY_SECONDS: float = 8.0
+    RETRY_MAX_RETRY_AFTER_SECONDS: float = 30.0  # Give up rather than wait longer than this
+    RETRY_MAX_PER_REQUEST: int = 4  # Retries shared by all upstream calls of one request
+    RETRY_BUDGET_RATIO: float = 0.2  # Retries allowed per first attempt, across the process
+    RETRY_BUDGET_MAX_TOKENS: float = 20.0
+
+    # Circuit breakers (one per Gemini model and Stability endpoint)
+    BREAKER_FAILURE_RATE_THRESHOLD: float = 0.5
+    BREAKER_MIN_CALLS: int = 5  # Calls in the window before the breaker can open
+    BREAKER_WINDOW_SECONDS: float = 60.0
+    BREAKER_OPEN_SECONDS: float = 30.0  # Time before probing a tripped upstream
+    BREAKER_HALF_OPEN_PROBES: int = 1
+
+    # Stability endpoint hedging
+    STABILITY_HEDGE_MODE: str = "hedge"  # "sequential", "hedge" or "race"
+    STABILITY_HEDGE_DELAY_SECONDS: float = 10.0  # Used until enough latency samples exist; also the upper bound
+    STABILITY_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    STABILITY_HEDGE_PERCENTILE: float = 0.95
+    STABILITY_HEDGE_MIN_SAMPLES: int = 20
+    STABILITY_LATENCY_WINDOW: int = 200
+
+    # Background image jobs
+    IMAGE_JOB_WORKERS: int = 4
+    IMAGE_JOB_QUEUE_SIZE: int = 1000
+    IMAGE_JOB_MAX_FINISHED: int = 1000  # Finished jobs kept for polling
+    IMAGE_JOB_TTL_SECONDS: float = 3600.0
+    IMAGE_JOB_POLL_INTERVAL_SECONDS: float = 0.5  # How often a WebSocket checks a job run by another worker
+
+    # Generated image store (sharded, bounded by size and age; 0 disables a bound)
+    IMAGE_STORE_DIR: str = "static/images/generated"
+    IMAGE_STORE_URL_PREFIX: str = "/static/images/generated"
+    IMAGE_STORE_MAX_BYTES: int = 5 * 1024 ** 3
+    IMAGE_STORE_MAX_AGE_SECONDS: float = 30 * 24 * 3600.0  # Since last use
+
+    # Per-platform image derivatives, written next to the master image
+    IMAGE_DERIVATIVES_ENABLED: bool = True
+    IMAGE_DERIVATIVE_FORMATS: List[str] = ["webp", "avif"]  # Formats this Pillow build can't write are skipped
+    IMAGE_THUMBNAIL_SIZE: int = 320
+    IMAGE_DERIVATIVE_TIMEOUT_SECONDS: float = 5.0  # The response leaves out variants that take longer
+    IMAGE_DERIVATIVE_MAX_PENDING_RENDERS: int = 4  # Beyond this, new images get no variants
+
+    # Render pool (processes for CPU-bound image work)
+    RENDER_MAX_WORKERS: int = 2
+    PLACEHOLDER_MAX_PENDING_RENDERS: int = 8  # Beyond this, new prompts get the generic placeholder
+
+    # Image cache
+    IMAGE_CACHE_ENABLED: bool = True
+    IMAGE_CACHE_DB: str = ".cache/image_index.sqlite"  # Also holds the image store index and image job states
     
+    # Warm-up (runs in the background after startup; /api/status/ready reports 503 until done)
+    WARMUP_ENABLED: bool = False
+    WARMUP_TIMEOUT_SECONDS: float = 60.0
+    WARMUP_REQUESTS_FILE: Optional[str] = None  # JSONL of {"endpoint": "ads"|"social"|"video", "payload": {...}}
+    WARMUP_REPLAY_CONCURRENCY: int = 4
+
+    # Request tracing
+    TRACE_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.01  # Fraction of requests traced
+    TRACE_HEADER: str = "X-Trace"  # "1" forces tracing for a request, "0" suppresses it
+    TRACE_EXPORT_PATH: str = ".cache/traces.jsonl"  # Empty disables export
+    TRACE_EXPORT_FORMAT: str = "jsonl"  # "jsonl" or "otlp"
+
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_INFO_SAMPLE_RATE: float = 1.0  # Fraction of INFO records kept
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # Per-logger overrides, e.g. {"httpx": 0.01}
     
     class Config:
         env_file = ".env"
@@ -1,14 +1,20 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from src.content_creation.routers import ads, social_content, video
+from src.content_creation.routers import ads, image_jobs, metrics, social_content, status, video
 from src.content_creation.config.settings import settings
 from src.content_creation.utils.logging import setup_logging
 from src.content_creation.middleware.request_tracking import RequestTrackingMiddleware
 from src.content_creation.utils.exceptions import APIError
+from src.content_creation.utils.generation import shutdown_executor
+from src.content_creation.utils.render_pool import shutdown_render_pool
+from src.content_creation.utils.clients import clients
+from src.content_creation.utils.warmup import warmup
+from src.content_creation.utils.image_jobs import image_jobs as image_job_manager
 
 # Set up logging
 logger = setup_logging()
@@ -21,11 +27,30 @@ if startup_errors:
         logger.error(f"Startup Error: {error}")
     raise SystemExit(1)
 
+# Application lifespan
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    clients.start()
+    app.state.clients = clients
+    await image_job_manager.start()
+    # Run the hooks and replays the routers registered with warmup, in the background and only
+    # when WARMUP_ENABLED is set; /api/status/ready reports 503 until it finishes
+    warmup.start()
+    try:
+        yield
+    finally:
+        await warmup.stop()
+        await image_job_manager.stop()
+        await clients.aclose()
+        shutdown_executor()
+        shutdown_render_pool()
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     docs_url="/api/docs",
-    openapi_url="/api/openapi.json")
+    openapi_url="/api/openapi.json",
+    lifespan=lifespan)
 
 # Add middleware
 app.add_middleware(
@@ -47,6 +72,9 @@ templates = Jinja2Templates(directory="templates")
 app.include_router(ads.router, prefix=settings.API_V1_PREFIX, tags=["Ad Generation"])
 app.include_router(social_content.router, prefix=settings.API_V1_PREFIX, tags=["Social Media Content"])
 app.include_router(video.router, prefix=settings.API_V1_PREFIX, tags=["AI Video Generation"])
+app.include_router(image_jobs.router, prefix=settings.API_V1_PREFIX, tags=["Image Jobs"])
+app.include_router(status.router, prefix=settings.API_V1_PREFIX, tags=["Status"])
+app.include_router(metrics.router, tags=["Metrics"])
 
 # Exception handlers
 @app.exception_handler(APIError)
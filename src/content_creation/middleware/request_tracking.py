@@ -1,45 +1,102 @@
-from fastapi import Request
 import logging
+import time
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..config.settings import settings
+from ..utils.metrics import http_request_duration, http_requests_in_flight, route_label
+from ..utils.retry import reset_request_retry_budget
+from ..utils.tracing import end_trace, server_timing, should_sample, span, start_trace
 
 logger = logging.getLogger(__name__)
 
-class RequestTrackingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-        request.state.request_id = request_id
-        
-        logger.info(
-            "Request started",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "url": str(request.url),
-                "client_host": request.client.host if request.client else None
-            }
-        )
-        
+REQUEST_ID_HEADER = b"x-request-id"
+TRACE_HEADER = settings.TRACE_HEADER.lower().encode("latin-1")
+
+
+class RequestTrackingMiddleware:
+    """Pure ASGI middleware that assigns a request ID and logs request duration.
+
+    The ID is taken from the ``X-Request-ID`` header or generated, stored on
+    ``request.state.request_id`` and echoed back in the response headers.
+    Latency is recorded per route template (not raw path) in
+    ``http_request_duration_seconds``. Sampled requests are traced under
+    their request ID: span timings are returned in a ``Server-Timing``
+    header and exported by ``utils.tracing``.
+    Unlike ``BaseHTTPMiddleware`` this adds no extra task or memory stream,
+    so streaming responses pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        trace_header = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+            elif name == TRACE_HEADER:
+                trace_header = value.decode("latin-1")
+        if not request_id:
+            request_id = str(uuid.uuid4())
+
+        scope.setdefault("state", {})["request_id"] = request_id
+        reset_request_retry_budget()
+
+        start = time.perf_counter()
+        status_code = 500
+        request_id_header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+        trace = start_trace(request_id) if should_sample(trace_header) else None
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [*message.get("headers", ()), request_id_header]
+                if trace is not None:
+                    # Streaming responses only report the spans finished before the first byte
+                    timing = server_timing(trace)
+                    total = f"total;dur={(time.perf_counter() - start) * 1000:.1f}"
+                    headers.append((b"server-timing", f"{timing}, {total}".lstrip(", ").encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        http_requests_in_flight.inc()
         try:
-            response = await call_next(request)
-            
-            logger.info(
-                "Request completed",
-                extra={
-                    "request_id": request_id,
-                    "status_code": response.status_code
-                }
-            )
-            
-            response.headers["X-Request-ID"] = request_id
-            return response
-            
+            with span("request", method=scope["method"], path=scope["path"]) as root:
+                await self.app(scope, receive, send_with_request_id)
+                if root is not None:
+                    root.set(route=route_label(scope), status_code=status_code)
         except Exception as e:
+            status_code = 500
             logger.error(
                 "Request failed",
                 extra={
                     "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
                     "error": str(e)
                 }
             )
             raise
+        finally:
+            http_requests_in_flight.dec()
+            if trace is not None:
+                end_trace(trace)
+            http_request_duration.labels(route_label(scope), scope["method"], status_code).observe(time.perf_counter() - start)
+
+        logger.info(
+            "Request completed",
+            extra={
+                "request_id": request_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+        )
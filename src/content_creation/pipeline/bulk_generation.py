@@ -0,0 +1,258 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from ..routers.ads import AdRequest, generate_ai_ad, generate_fallback_ads
+from ..routers.social_content import (
+    SocialContentRequest,
+    build_image_prompt,
+    build_social_response,
+    create_placeholder_image,
+    generate_fallback_contents,
+)
+from ..routers.video import VideoConceptRequest, generate_video_script
+from ..utils.clients import clients
+from ..utils.rate_limiter import BULK, request_priority
+
+logger = logging.getLogger(__name__)
+
+# CSV cells holding lists use this separator, e.g. "Waterproof;Lightweight"
+CSV_LIST_FIELDS = {"key_features"}
+CSV_LIST_SEPARATOR = ";"
+
+# Offline runs render fallback copy for this many records per call
+OFFLINE_CHUNK_SIZE = 100
+
+
+def read_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream records from a CSV (with a header row) or JSONL file, one at a time."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                # Empty cells fall back to the request model's defaults
+                record = {key: value for key, value in row.items() if key and value not in (None, "")}
+                for field in CSV_LIST_FIELDS & record.keys():
+                    record[field] = [item.strip() for item in record[field].split(CSV_LIST_SEPARATOR) if item.strip()]
+                yield record
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+async def generate_record(kind: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one input record through the same generation path as the matching API endpoint."""
+    if kind == "social":
+        # Bulk runs wait for images instead of handing them to the job queue
+        request = SocialContentRequest(**{**record, "async_image": False})
+        return await build_social_response(request, clients.http_client)
+
+    if kind == "ad":
+        ad = AdRequest(**record)
+        return {"ad_copy": await generate_ai_ad(ad.brand_name, ad.product_name, ad.target_audience, ad.key_features, ad.tone)}
+
+    if kind == "video":
+        video = VideoConceptRequest(**record)
+        script = await generate_video_script(video.title.strip(), video.duration)
+        return {"video_title": video.title, "duration": f"{video.duration} seconds", "detailed_script": script}
+
+    raise ValueError(f"Unknown kind: {kind}")
+
+
+async def generate_offline_records(kind: str, records: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], Exception]]:
+    """Render fallback results for a chunk of records, with all their copy rendered in one call.
+
+    Each entry is the record's result, or the exception that failed it.
+    """
+    if kind == "video":
+        raise ValueError("Video scripts have no offline fallback")
+    if kind not in ("social", "ad"):
+        raise ValueError(f"Unknown kind: {kind}")
+
+    requests: List[Any] = []
+    for record in records:
+        try:
+            requests.append(SocialContentRequest(**record) if kind == "social" else AdRequest(**record))
+        except Exception as e:
+            requests.append(e)
+    valid = [request for request in requests if not isinstance(request, Exception)]
+
+    if kind == "social":
+        copies = iter(generate_fallback_contents(valid))
+    else:
+        copies = iter(generate_fallback_ads([(ad.brand_name, ad.product_name, ad.target_audience, ad.key_features, ad.tone) for ad in valid]))
+
+    outcomes: List[Union[Dict[str, Any], Exception]] = []
+    for request in requests:
+        if isinstance(request, Exception):
+            outcomes.append(request)
+        elif kind == "ad":
+            outcomes.append({"ad_copy": next(copies)})
+        else:
+            result = {"message": next(copies), "platform": request.platform}
+            if request.generate_image:
+                result["image_url"] = await create_placeholder_image(build_image_prompt(request))
+            outcomes.append(result)
+    return outcomes
+
+
+class Checkpoint:
+    """Progress of a bulk run, saved next to the output so a crashed run can resume.
+
+    Records finish out of order, so progress is a low-water mark (every index
+    below ``next_index`` is done) plus the indices done above it. The saved
+    output offset is where the output file ends for exactly those records;
+    on resume the output is truncated back to it, so each record is written
+    exactly once. Memory is bounded by how far records finish out of order,
+    not by the input size.
+    """
+
+    def __init__(self, path: Path, input_path: Path, kind: str):
+        self.path = path
+        self.input_path = str(input_path)
+        self.kind = kind
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all progress, so every record runs again."""
+        self.next_index = 0
+        self.done_above: Set[int] = set()
+        self.output_offset = 0
+
+    def load(self) -> bool:
+        """Load saved progress; returns False when there is nothing to resume."""
+        if not self.path.exists():
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state["input"] != self.input_path or state["kind"] != self.kind:
+            raise ValueError(f"Checkpoint {self.path} belongs to a run of {state['kind']} records from {state['input']}")
+        self.next_index = state["next_index"]
+        self.done_above = set(state["done_above"])
+        self.output_offset = state["output_offset"]
+        return True
+
+    def is_done(self, index: int) -> bool:
+        return index < self.next_index or index in self.done_above
+
+    def mark_done(self, index: int) -> None:
+        self.done_above.add(index)
+        while self.next_index in self.done_above:
+            self.done_above.remove(self.next_index)
+            self.next_index += 1
+
+    def save(self, output_offset: int) -> None:
+        self.output_offset = output_offset
+        state = {
+            "input": self.input_path,
+            "kind": self.kind,
+            "next_index": self.next_index,
+            "done_above": sorted(self.done_above),
+            "output_offset": output_offset,
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+async def run_bulk(
+    input_path: Path,
+    output_path: Path,
+    kind: str,
+    concurrency: int,
+    offline: bool = False,
+    checkpoint_path: Optional[Path] = None,
+    checkpoint_every: int = 100,
+) -> Dict[str, int]:
+    """Generate content for every record of ``input_path``, appending JSONL results to ``output_path``.
+
+    A fixed set of ``concurrency`` workers pulls from a bounded queue fed by a
+    streaming reader, so memory stays flat however large the input is. All
+    upstream calls run at bulk priority through the shared rate limiters.
+    Offline runs queue chunks of ``OFFLINE_CHUNK_SIZE`` records and render
+    each chunk's fallback copy in one call.
+    Each output line is ``{"index", "status", "result" | "error"}``, in
+    completion order. Returns counts of ok, failed and skipped records.
+    """
+    checkpoint = Checkpoint(checkpoint_path or output_path.with_name(output_path.name + ".checkpoint"), input_path, kind)
+    resumed = checkpoint.load()
+    if resumed and not output_path.exists():
+        # The checkpointed records' results are gone, so they have to run again
+        logger.warning(f"Checkpoint {checkpoint.path} found but output {output_path} is missing; starting from the beginning")
+        checkpoint.reset()
+        resumed = False
+    if resumed:
+        logger.info(f"Resuming from checkpoint: {checkpoint.next_index} records done, {len(checkpoint.done_above)} more beyond")
+
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+    queue: asyncio.Queue[Optional[List[Tuple[int, Dict[str, Any]]]]] = asyncio.Queue(maxsize=concurrency * 2)
+    started = time.perf_counter()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "r+b" if resumed else "wb") as output:
+        # Drop anything written after the last checkpoint; those records run again
+        output.truncate(checkpoint.output_offset)
+        output.seek(checkpoint.output_offset)
+
+        def write_result(index: int, result: Dict[str, Any]) -> None:
+            output.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+            checkpoint.mark_done(index)
+            finished = counts["ok"] + counts["failed"]
+            if finished % checkpoint_every == 0:
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.save(output.tell())
+                logger.info(f"{finished} records done ({finished / (time.perf_counter() - started):.1f}/s)")
+
+        async def worker() -> None:
+            request_priority.set(BULK)
+            while (chunk := await queue.get()) is not None:
+                try:
+                    if offline:
+                        outcomes = await generate_offline_records(kind, [record for _, record in chunk])
+                    else:
+                        outcomes = [await generate_record(kind, record) for _, record in chunk]
+                except Exception as e:
+                    outcomes = [e] * len(chunk)
+                for (index, _), outcome in zip(chunk, outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Bulk record {index} failed: {str(outcome)}")
+                        result = {"index": index, "status": "error", "error": str(outcome)}
+                        counts["failed"] += 1
+                    else:
+                        result = {"index": index, "status": "ok", "result": outcome}
+                        counts["ok"] += 1
+                    write_result(index, result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            chunk_size = OFFLINE_CHUNK_SIZE if offline else 1
+            chunk = []
+            for index, record in enumerate(read_records(input_path)):
+                if checkpoint.is_done(index):
+                    counts["skipped"] += 1
+                    continue
+                chunk.append((index, record))
+                if len(chunk) == chunk_size:
+                    await queue.put(chunk)
+                    chunk = []
+            if chunk:
+                await queue.put(chunk)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            output.flush()
+            os.fsync(output.fileno())
+            checkpoint.save(output.tell())
+
+    logger.info(f"Bulk run finished: {counts}")
+    return counts
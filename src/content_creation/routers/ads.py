@@ -1,22 +1,20 @@
-import os
 import logging
-import google.generativeai as genai
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from dotenv import load_dotenv
+from ..config.settings import settings
+from ..components.fallback_templates import render_ad, render_ads_many
+from ..utils.cache import get_response_cache, make_cache_key
+from ..utils.clients import clients
+from ..utils.generation import generate_content
+from ..utils.metrics import record_fallback
+from ..utils.tracing import span
+from ..utils.warmup import warmup
+from ..utils.single_flight import single_flight
+from ..utils.sse import sse_response, stream_generation
 
-# Load environment variables from .env file
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure the Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
-
 # Set up the model
 generation_config = {
     "temperature": 0.7,
@@ -38,45 +36,17 @@ class AdRequest(BaseModel):
 
 def generate_fallback_ad(brand_name: str, product_name: str, target_audience: str, key_features: list[str], tone: str) -> str:
     """Generate a fallback advertisement without using external APIs."""
+    record_fallback("ad")
+    return render_ad(brand_name, product_name, target_audience, key_features, tone)
 
-    # Templates based on tone
-    templates = {
-        "professional": "Introducing {product_name} from {brand_name}. Designed specifically for {target_audience}, it offers {features}. Choose quality. Choose {brand_name}.",
-        "friendly": "Hey there! Check out {brand_name}'s new {product_name}! Perfect for {target_audience} like you, it comes with {features}. Give it a try!",
-        "humorous": "Tired of boring products? {brand_name}'s {product_name} is here to save the day! With {features}, it's exactly what {target_audience} have been waiting for. Warning: May cause extreme satisfaction!",
-        "formal": "We are pleased to announce {brand_name}'s latest innovation: {product_name}. Tailored for {target_audience}, it provides {features}. We invite you to experience the difference.",
-        "excited": "WOW! {brand_name} just launched the AMAZING {product_name}! It's PERFECT for {target_audience} and comes with {features}! You'll LOVE it!",
-        "casual": "So, {brand_name} just dropped their new {product_name}. It's pretty cool - made for {target_audience} and has {features}. Worth checking out!"
-    }
-
-    # Default template if tone not found
-    default_template = "Introducing {product_name} from {brand_name}. Perfect for {target_audience}, featuring {features}."
-
-    # Get the appropriate template
-    template = templates.get(tone.lower(), default_template)
-
-    # Format features as a comma-separated list with "and" before the last item
-    if len(key_features) == 1:
-        features_text = key_features[0]
-    elif len(key_features) == 2:
-        features_text = f"{key_features[0]} and {key_features[1]}"
-    else:
-        features_text = ", ".join(key_features[:-1]) + f", and {key_features[-1]}"
-
-    # Format the final ad copy
-    ad_copy = template.format(
-        brand_name=brand_name,
-        product_name=product_name,
-        target_audience=target_audience,
-        features=features_text
-    )
-
-    return ad_copy
+def generate_fallback_ads(briefs: list[tuple[str, str, str, list[str], str]]) -> list[str]:
+    """Generate fallback ads for many ``(brand_name, product_name, target_audience, key_features, tone)`` briefs at once."""
+    record_fallback("ad", len(briefs))
+    return render_ads_many(briefs)
 
-def generate_ai_ad(brand_name: str, product_name: str, target_audience: str, key_features: list[str], tone: str):
-    """Generate an AI-powered advertisement copy using Google's Gemini API."""
-
-    prompt = f"""
+def build_ad_prompt(brand_name: str, product_name: str, target_audience: str, key_features: list[str], tone: str) -> str:
+    """Build the Gemini prompt for an advertisement."""
+    return f"""
     You are an expert advertising copywriter.
 
     Write a {tone} advertisement for the following product, designed to resonate with the target audience.
@@ -95,23 +65,50 @@ def generate_ai_ad(brand_name: str, product_name: str, target_audience: str, key
     Optional: Include a clever tagline or slogan if it fits naturally.
     """
 
+def build_ad_cache_key(brand_name: str, product_name: str, target_audience: str, key_features: list[str], tone: str) -> str:
+    """Build the response cache key for an advertisement request."""
+    return make_cache_key(
+        "ads",
+        {
+            "brand_name": brand_name,
+            "product_name": product_name,
+            "target_audience": target_audience,
+            "key_features": key_features,
+            "tone": tone,
+        },
+        settings.GEMINI_MODEL_NAME,
+        generation_config,
+    )
+
+async def generate_ai_ad(brand_name: str, product_name: str, target_audience: str, key_features: list[str], tone: str):
+    """Generate an AI-powered advertisement copy using Google's Gemini API."""
+
+    with span("prompt_build"):
+        prompt = build_ad_prompt(brand_name, product_name, target_audience, key_features, tone)
+
+    # Serve repeated briefs from the response cache
+    cache = get_response_cache()
+    cache_key = build_ad_cache_key(brand_name, product_name, target_audience, key_features, tone)
+    with span("cache_lookup", endpoint="ads"):
+        cached = await cache.get("ads", cache_key)
+    if cached is not None:
+        return cached
 
     try:
         # Try to use Gemini API
         try:
-            # Initialize the model
-            model = genai.GenerativeModel(
-                model_name="gemini-pro",
-                generation_config=generation_config
-            )
+            # Reuse the shared model for this config
+            model = clients.model(settings.GEMINI_MODEL_NAME, generation_config)
 
-            # Generate content
-            response = model.generate_content(prompt)
-            logger.info(f"Gemini API response: {response}")
+            # Generate content, sharing one upstream call between identical concurrent requests
+            response = await single_flight.do(cache_key, lambda: generate_content(model, prompt))
+            logger.debug("Gemini API response: %s", response)
 
             # Check if the response has text
             if response.text:
-                return response.text.strip()
+                ad_copy = response.text.strip()
+                await cache.set("ads", cache_key, ad_copy)
+                return ad_copy
             else:
                 # If no text in response, use fallback
                 logger.warning("No text in Gemini API response. Using fallback.")
@@ -132,7 +129,7 @@ def generate_ai_ad(brand_name: str, product_name: str, target_audience: str, key
 async def generate_ad(ad_request: AdRequest):
     """Endpoint to generate an ad using AI."""
     try:
-        ad_copy = generate_ai_ad(
+        ad_copy = await generate_ai_ad(
             ad_request.brand_name,
             ad_request.product_name,
             ad_request.target_audience,
@@ -142,3 +139,26 @@ async def generate_ad(ad_request: AdRequest):
         return {"ad_copy": ad_copy}
     except HTTPException as e:
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+
+@router.post("/generate_ad/stream")
+async def generate_ad_stream(ad_request: AdRequest):
+    """Endpoint to stream an AI-generated ad as Server-Sent Events."""
+    args = (
+        ad_request.brand_name,
+        ad_request.product_name,
+        ad_request.target_audience,
+        ad_request.key_features,
+        ad_request.tone,
+    )
+    model = clients.model(settings.GEMINI_MODEL_NAME, generation_config)
+    return sse_response(stream_generation(
+        model,
+        build_ad_prompt(*args),
+        fallback=lambda: generate_fallback_ad(*args),
+        cache=get_response_cache(),
+        cache_endpoint="ads",
+        cache_key=build_ad_cache_key(*args),
+    ))
+
+clients.declare_model(settings.GEMINI_MODEL_NAME, generation_config)
+warmup.register_replay("ads", lambda payload: generate_ai_ad(**AdRequest(**payload).model_dump()))
@@ -0,0 +1,34 @@
+import logging
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from ..utils.image_jobs import FINISHED_STATUSES, image_jobs
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/image_jobs/{job_id}")
+async def get_image_job(job_id: str):
+    """Return the current state of an image generation job."""
+    job = await image_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Image job not found")
+    return job
+
+@router.websocket("/image_jobs/{job_id}/ws")
+async def watch_image_job(websocket: WebSocket, job_id: str):
+    """Send the job state on connect and again when the job finishes."""
+    await websocket.accept()
+    job = await image_jobs.get(job_id)
+    if job is None:
+        await websocket.send_json({"id": job_id, "status": "not_found"})
+        await websocket.close(code=1008)
+        return
+
+    try:
+        await websocket.send_json(job)
+        if job["status"] not in FINISHED_STATUSES:
+            # The job may run in another worker process; wait() polls for it then
+            job = await image_jobs.wait(job_id)
+            await websocket.send_json(job or {"id": job_id, "status": "not_found"})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Client disconnected while watching image job {job_id}")
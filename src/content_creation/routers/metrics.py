@@ -0,0 +1,72 @@
+import asyncio
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..utils.cache import get_response_cache
+from ..utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, breaker_states
+from ..utils.image_jobs import image_jobs
+from ..utils.image_store import get_image_store
+from ..utils.metrics import registry
+from ..utils.rate_limiter import rate_limiter_states
+from ..utils.retry import retry_policy
+from ..utils.single_flight import single_flight
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BREAKER_STATES = (CLOSED, OPEN, HALF_OPEN)
+
+
+def collect_retries():
+    for upstream, counters in retry_policy.stats()["upstreams"].items():
+        for event, count in counters.items():
+            yield {"upstream": upstream, "event": event}, count
+
+
+def collect_cache():
+    for endpoint, counts in get_response_cache().stats()["endpoints"].items():
+        yield {"endpoint": endpoint, "result": "hit"}, counts["hits"]
+        yield {"endpoint": endpoint, "result": "miss"}, counts["misses"]
+
+
+def collect_breakers():
+    for name, status in breaker_states().items():
+        for state in BREAKER_STATES:
+            yield {"upstream": name, "state": state}, 1 if status["state"] == state else 0
+
+
+def collect_rate_limit_queues():
+    for name, status in rate_limiter_states().items():
+        for lane, depth in status["queued"].items():
+            yield {"upstream": name, "lane": lane}, depth
+
+
+def collect_image_jobs():
+    for key, value in image_jobs.stats().items():
+        if isinstance(value, (int, float)):
+            yield {"stat": key}, value
+
+
+# Read from SQLite off the event loop by each scrape, before the registry is exposed
+_image_store_stats = {}
+
+
+def collect_image_store():
+    for key in ("bytes", "files", "evicted"):
+        if key in _image_store_stats:
+            yield {"stat": key}, _image_store_stats[key]
+
+
+# Existing status counters are read at scrape time rather than duplicated
+registry.collector("upstream_retry_events_total", "counter", "Retry policy events by upstream.", collect_retries)
+registry.collector("response_cache_lookups_total", "counter", "Response cache lookups by endpoint and result.", collect_cache)
+registry.collector("circuit_breaker_state", "gauge", "1 for the current state of each circuit breaker.", collect_breakers)
+registry.collector("rate_limiter_queued", "gauge", "Callers waiting on an upstream rate limiter.", collect_rate_limit_queues)
+registry.collector("single_flight_in_flight", "gauge", "Coalesced generations currently in flight.", lambda: [({}, len(single_flight.waiters()))])
+registry.collector("image_jobs", "gauge", "Image job queue and worker counts.", collect_image_jobs)
+registry.collector("image_store", "gauge", "Image store usage and evictions.", collect_image_store)
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Return all metrics in the Prometheus text exposition format."""
+    _image_store_stats.update(await asyncio.to_thread(get_image_store().stats))
+    return PlainTextResponse(registry.expose(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,27 +1,41 @@
-import os
+import json
+import hashlib
+import asyncio
 import logging
-import base64
-import google.generativeai as genai
-import requests
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+import time
+from functools import partial
+import httpx
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
-from dotenv import load_dotenv
+from typing import List, Optional, Tuple
 from pathlib import Path
+from ..config.settings import settings
+from ..components.fallback_templates import render_social, render_social_many
+from ..utils.cache import get_response_cache, make_cache_key
+from ..utils.clients import clients
+from ..utils.generation import gemini_breaker_name_for, generate_content
+from ..utils.single_flight import SingleFlight, single_flight
+from ..utils.retry import retry_policy
+from ..utils.sse import sse_response, stream_generation
+from ..utils.http_client import get_http_client
+from ..utils.circuit_breaker import get_breaker
+from ..utils.hedging import LatencyTracker, hedged_race
+from ..utils.image_cache import get_image_cache, make_image_key
+from ..utils.image_derivatives import create_image_variants
+from ..utils.image_jobs import image_jobs
+from ..utils.image_render import render_placeholder, render_simple_placeholder, warm_placeholder_renderer
+from ..utils.image_stream import stream_image_to_file
+from ..utils.image_store import get_image_store
+from ..utils.exceptions import UpstreamHTTPError
+from ..utils.metrics import generated_image_bytes, record_fallback, record_upstream
+from ..utils.render_pool import run_render
+from ..utils.tracing import span
+from ..utils.warmup import warmup
+from ..utils.rate_limiter import BULK, get_rate_limiter, parse_retry_after, request_priority
 
-# Load environment variables from .env file
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-STABILITY_API_KEY = os.getenv("STABILITY_API_KEY")
-
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure the Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
-
 # Set up the model
 generation_config = {
     "temperature": 0.7,
@@ -30,13 +44,28 @@ generation_config = {
     "max_output_tokens": 300,
 }
 
-# Create directory for storing images if it doesn't exist
-STATIC_DIR = Path("static/images/generated")
-try:
-    STATIC_DIR.mkdir(parents=True, exist_ok=True)
-    logger.info(f"Static directory created/verified at: {STATIC_DIR.absolute()}")
-except Exception as e:
-    logger.error(f"Error creating static directory: {str(e)}")
+STABILITY_WARMUP_URL = "https://api.stability.ai/v1/engines/list"
+STABILITY_WARMUP_CONNECTIONS = 2
+
+# Rolling latency of successful Stability calls, per endpoint URL
+stability_latency = LatencyTracker(window=settings.STABILITY_LATENCY_WINDOW)
+
+def stability_hedge_delay(endpoint_url: str) -> Optional[float]:
+    """Return how long to wait on ``endpoint_url`` before also trying the next endpoint."""
+    mode = settings.STABILITY_HEDGE_MODE
+    if mode == "race":
+        return 0.0
+    if mode != "hedge":
+        return None  # Sequential: only move on after a failure
+
+    observed = stability_latency.percentile(
+        endpoint_url,
+        settings.STABILITY_HEDGE_PERCENTILE,
+        min_samples=settings.STABILITY_HEDGE_MIN_SAMPLES,
+    )
+    if observed is None:
+        return settings.STABILITY_HEDGE_DELAY_SECONDS
+    return min(max(observed, settings.STABILITY_HEDGE_MIN_DELAY_SECONDS), settings.STABILITY_HEDGE_DELAY_SECONDS)
 
 # Create FastAPI router
 router = APIRouter()
@@ -55,198 +84,27 @@ class SocialContentRequest(BaseModel):
     include_emojis: Optional[bool] = True
     generate_image: Optional[bool] = False
     image_prompt: Optional[str] = None
+    async_image: Optional[bool] = False  # Return an image_job_id instead of waiting for the image
 
-def generate_fallback_content(request: SocialContentRequest) -> str:
-    """Generate content without using external APIs as a fallback mechanism."""
-
-    # Platform-specific templates
-    templates = {
-        "instagram": "✨ NEW PRODUCT ALERT! ✨\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
-        "facebook": "🔥 INTRODUCING: {product_name} 🔥\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
-        "twitter": "{intro} {features} {special} {target} {hashtags}",
-        "linkedin": "🚀 Product Announcement 🚀\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
-        "tiktok": "Check out the new {product_name}! 🤩\n{features}\n{special}\n{hashtags}"
-    }
-
-    # Emoji sets based on tone
-    emojis = {
-        "engaging": ["✨", "🔥", "👀", "🙌", "💯"],
-        "professional": ["📊", "💼", "🚀", "📈", "✅"],
-        "friendly": ["😊", "👋", "🤗", "💕", "👍"],
-        "humorous": ["😂", "🤣", "😜", "🤪", "😎"],
-        "excited": ["🤩", "🎉", "🔥", "💥", "⚡"],
-        "formal": ["📝", "📋", "🔍", "📌", "🔖"]
-    }
-
-    # Hashtag templates
-    hashtag_templates = {
-        "instagram": ["#NewProduct", "#MustHave", "#{product_category}Life", "#{product_name}Launch", "#Innovation"],
-        "facebook": ["#NewProduct", "#{product_category}", "#{product_name}", "#Innovation"],
-        "twitter": ["#New", "#{product_category}", "#{product_name}"],
-        "linkedin": ["#ProductLaunch", "#Innovation", "#{product_category}Industry", "#{product_name}"],
-        "tiktok": ["#fyp", "#{product_category}Check", "#{product_name}Reveal", "#NewProductAlert"]
-    }
-
-    # Get the appropriate template and emoji set
-    template = templates.get(request.platform.lower(), templates["instagram"])
-    emoji_set = emojis.get(request.tone.lower(), emojis["engaging"])
-
-    # Format product name
-    product_name = request.product_name or "our new product"
-    product_category = request.product_category or "product"
-
-    # Create intro
-    intro = f"Introducing {product_name}" + (f", our new {product_category}" if request.product_category else "") + "!"
-    if request.include_emojis:
-        intro = f"{emoji_set[0]} {intro} {emoji_set[1]}"
-
-    # Format features
-    features = ""
-    if request.key_features:
-        features = "Key Features:"
-        for i, feature in enumerate(request.key_features):
-            emoji = emoji_set[i % len(emoji_set)] if request.include_emojis else ""
-            features += f"\n- {emoji} {feature}"
-
-    # Format special features
-    special = ""
-    if request.special_features:
-        special = f"Special Features: {request.special_features}"
-        if request.include_emojis:
-            special = f"{emoji_set[2]} {special}"
-
-    # Format target audience
-    target = ""
-    if request.target_audience:
-        target = f"Perfect for {request.target_audience}!"
-        if request.include_emojis:
-            target = f"{emoji_set[3]} {target}"
-
-    # Format hashtags
-    hashtags = ""
-    if request.include_hashtags:
-        hashtag_list = hashtag_templates.get(request.platform.lower(), hashtag_templates["instagram"])
-        formatted_hashtags = []
-        for tag in hashtag_list:
-            if "{product_name}" in tag and request.product_name:
-                tag = tag.replace("{product_name}", request.product_name.replace(" ", ""))
-            elif "{product_category}" in tag and request.product_category:
-                tag = tag.replace("{product_category}", request.product_category.replace(" ", ""))
-            formatted_hashtags.append(tag)
-        hashtags = " ".join(formatted_hashtags)
-
-    # Format the final content
-    content = template.format(
-        intro=intro,
-        product_name=product_name,
-        features=features,
-        special=special,
-        target=target,
-        hashtags=hashtags
-    )
-
-    # Truncate for Twitter
-    if request.platform.lower() == "twitter" and len(content) > 280:
-        content = content[:277] + "..."
+class SocialContentBatchRequest(BaseModel):
+    items: List[SocialContentRequest]
+    stream: Optional[bool] = False  # Emit NDJSON results as they complete
 
-    return content
-
-def generate_social_content(request: SocialContentRequest):
-
-    # Platform-specific templates
-    templates = {
-        "instagram": "✨ NEW PRODUCT ALERT! ✨\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
-        "facebook": "🔥 INTRODUCING: {product_name} 🔥\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
-        "twitter": "{intro} {features} {special} {target} {hashtags}",
-        "linkedin": "🚀 Product Announcement 🚀\n\n{intro}\n\n{features}\n\n{special}\n\n{target}\n\n{hashtags}",
-        "tiktok": "Check out the new {product_name}! 🤩\n{features}\n{special}\n{hashtags}"
-    }
+# Request fields that only affect image generation
+TEXT_CACHE_EXCLUDED_FIELDS = {"generate_image", "image_prompt", "async_image"}
 
-    # Emoji sets based on tone
-    emojis = {
-        "engaging": ["✨", "🔥", "👀", "🙌", "💯"],
-        "professional": ["📊", "💼", "🚀", "📈", "✅"],
-        "friendly": ["😊", "👋", "🤗", "💕", "👍"],
-        "humorous": ["😂", "🤣", "😜", "🤪", "😎"],
-        "excited": ["🤩", "🎉", "🔥", "💥", "⚡"],
-        "formal": ["📝", "📋", "🔍", "📌", "🔖"]
-    }
-
-    # Hashtag templates
-    hashtag_templates = {
-        "instagram": ["#NewProduct", "#MustHave", "#{product_category}Life", "#{product_name}Launch", "#Innovation"],
-        "facebook": ["#NewProduct", "#{product_category}", "#{product_name}", "#Innovation"],
-        "twitter": ["#New", "#{product_category}", "#{product_name}"],
-        "linkedin": ["#ProductLaunch", "#Innovation", "#{product_category}Industry", "#{product_name}"],
-        "tiktok": ["#fyp", "#{product_category}Check", "#{product_name}Reveal", "#NewProductAlert"]
-    }
-
-    # Get the appropriate template and emoji set
-    template = templates.get(request.platform.lower(), templates["instagram"])
-    emoji_set = emojis.get(request.tone.lower(), emojis["engaging"])
-
-    # Format product name
-    product_name = request.product_name or "our new product"
-    product_category = request.product_category or "product"
-
-    # Create intro
-    intro = f"Introducing {product_name}" + (f", our new {product_category}" if request.product_category else "") + "!"
-    if request.include_emojis:
-        intro = f"{emoji_set[0]} {intro} {emoji_set[1]}"
-
-    # Format features
-    features = ""
-    if request.key_features:
-        features = "Key Features:"
-        for i, feature in enumerate(request.key_features):
-            emoji = emoji_set[i % len(emoji_set)] if request.include_emojis else ""
-            features += f"\n- {emoji} {feature}"
-
-    # Format special features
-    special = ""
-    if request.special_features:
-        special = f"Special Features: {request.special_features}"
-        if request.include_emojis:
-            special = f"{emoji_set[2]} {special}"
-
-    # Format target audience
-    target = ""
-    if request.target_audience:
-        target = f"Perfect for {request.target_audience}!"
-        if request.include_emojis:
-            target = f"{emoji_set[3]} {target}"
-
-    # Format hashtags
-    hashtags = ""
-    if request.include_hashtags:
-        hashtag_list = hashtag_templates.get(request.platform.lower(), hashtag_templates["instagram"])
-        formatted_hashtags = []
-        for tag in hashtag_list:
-            if "{product_name}" in tag and request.product_name:
-                tag = tag.replace("{product_name}", request.product_name.replace(" ", ""))
-            elif "{product_category}" in tag and request.product_category:
-                tag = tag.replace("{product_category}", request.product_category.replace(" ", ""))
-            formatted_hashtags.append(tag)
-        hashtags = " ".join(formatted_hashtags)
-
-    # Format the final content
-    content = template.format(
-        intro=intro,
-        product_name=product_name,
-        features=features,
-        special=special,
-        target=target,
-        hashtags=hashtags
-    )
-
-    # Truncate for Twitter
-    if request.platform.lower() == "twitter" and len(content) > 280:
-        content = content[:277] + "..."
+def generate_fallback_content(request: SocialContentRequest) -> str:
+    """Generate content without using external APIs as a fallback mechanism."""
+    record_fallback("social")
+    return render_social(request)
 
-    return content
+def generate_fallback_contents(requests: List[SocialContentRequest]) -> List[str]:
+    """Generate fallback content for many requests at once, e.g. a whole batch during an outage."""
+    record_fallback("social", len(requests))
+    return render_social_many(requests)
 
-def generate_social_content(request: SocialContentRequest):
-    """Generate social media content using Google's Gemini API."""
+def build_social_prompt(request: SocialContentRequest) -> str:
+    """Build the Gemini prompt for a social media post."""
 
     # Create platform-specific instructions
     platform_instructions = {
@@ -280,7 +138,7 @@ def generate_social_content(request: SocialContentRequest):
         audience_info = f"Target Audience: {request.target_audience}"
 
     # Build the prompt for Gemini
-    prompt = f"""
+    return f"""
     {platform_instructions.get(request.platform.lower(), "Create a social media post")}
 
     Content Title/Topic: {request.content_title}
@@ -294,22 +152,51 @@ def generate_social_content(request: SocialContentRequest):
     {"Use appropriate emojis to enhance engagement." if request.include_emojis else "Do not use emojis."}
     """
 
+def build_social_cache_key(request: SocialContentRequest) -> str:
+    """Build the response cache key for a social content request; image fields don't affect the text."""
+    return make_cache_key(
+        "social",
+        request.model_dump(exclude=TEXT_CACHE_EXCLUDED_FIELDS),
+        settings.GEMINI_MODEL_NAME,
+        generation_config,
+    )
+
+async def generate_social_content(request: SocialContentRequest, fallback_content: Optional[str] = None):
+    """Generate social media content using Google's Gemini API.
+
+    If ``fallback_content`` is given it is returned on a cache miss instead of
+    calling Gemini.
+    """
+
+    with span("prompt_build"):
+        prompt = build_social_prompt(request)
+
+    # Serve repeated briefs from the response cache
+    cache = get_response_cache()
+    cache_key = build_social_cache_key(request)
+    with span("cache_lookup", endpoint="social"):
+        cached = await cache.get("social", cache_key)
+    if cached is not None:
+        return cached
+    if fallback_content is not None:
+        record_fallback("social")
+        return fallback_content
+
     try:
         # Try to use Gemini API
         try:
-            # Initialize the model
-            model = genai.GenerativeModel(
-                model_name="gemini-pro",
-                generation_config=generation_config
-            )
+            # Reuse the shared model for this config
+            model = clients.model(settings.GEMINI_MODEL_NAME, generation_config)
 
-            # Generate content
-            response = model.generate_content(prompt)
-            logger.info(f"Gemini API response: {response}")
+            # Generate content, sharing one upstream call between identical concurrent requests
+            response = await single_flight.do(cache_key, lambda: generate_content(model, prompt))
+            logger.debug("Gemini API response: %s", response)
 
             # Check if the response has text
             if response.text:
-                return response.text.strip()
+                content = response.text.strip()
+                await cache.set("social", cache_key, content)
+                return content
             else:
                 # If no text in response, use fallback
                 logger.warning("No text in Gemini API response. Using fallback.")
@@ -325,17 +212,44 @@ def generate_social_content(request: SocialContentRequest):
         logger.error(f"Error generating social content: {str(e)}")
         raise HTTPException(status_code=500, detail="Error generating social content.")
 
-def generate_ai_image(prompt: str) -> str:
-    """Generate an image using Stability AI API and return the path to the saved image."""
+async def save_generated_image(tmp_path: Path, cache_key: str, image_cache) -> str:
+    """Move a fully written temporary image into the image store and index it."""
+    image_store = get_image_store()
+
+    # The rename is atomic, so concurrent workers never see a partial image
+    with span("image_write"):
+        image_path = await image_store.adopt(tmp_path, f"image_{cache_key[:20]}.png")
+    generated_image_bytes.labels("generated").inc(image_path.stat().st_size)
+
+    image_url = image_store.url_for(image_path)
+    if image_cache is not None:
+        await image_cache.store(cache_key, image_url, image_path)
+    return image_url
+
+async def generate_ai_image(prompt: str, client: httpx.AsyncClient) -> Tuple[Optional[str], bool]:
+    """Generate an image using Stability AI API and return ``(image_url, is_placeholder)``.
+
+    ``is_placeholder`` is True when generation failed and the URL points at a
+    placeholder instead. Identical concurrent prompts share a single generation.
+    """
+    return await single_flight.do(f"image:{prompt}", lambda: _generate_ai_image(prompt, client))
+
+async def generate_ai_image_url(prompt: str, client: httpx.AsyncClient) -> Optional[str]:
+    """Generate an image like ``generate_ai_image`` and return only its URL."""
+    image_url, _ = await generate_ai_image(prompt, client)
+    return image_url
+
+async def _generate_ai_image(prompt: str, client: httpx.AsyncClient) -> Tuple[Optional[str], bool]:
+    """Generate an image using Stability AI API and return ``(image_url, is_placeholder)``."""
     try:
-        if not STABILITY_API_KEY:
+        if not settings.STABILITY_API_KEY:
             logger.warning("Stability API key is missing. Cannot generate image.")
-            return None
+            return None, False
 
         # For testing purposes, if no API key is available, generate a placeholder image
-        if STABILITY_API_KEY.strip() == "":
+        if settings.STABILITY_API_KEY.strip() == "":
             logger.warning("Using placeholder image generation since no Stability API key is provided")
-            return create_placeholder_image(prompt)
+            return await create_placeholder_image(prompt), True
 
         # Clean up the prompt to ensure it's properly formatted
         # Remove any extra quotes and avoid duplication
@@ -373,11 +287,13 @@ def generate_ai_image(prompt: str) -> str:
         ]
 
         headers = {
-            "Authorization": f"Bearer {STABILITY_API_KEY}",
+            "Authorization": f"Bearer {settings.STABILITY_API_KEY}",
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
 
+        negative_prompt = "blurry, low quality, distorted, deformed, disfigured, bad anatomy, watermark, text, logo"
+
         # Base request body
         base_body = {
             "text_prompts": [
@@ -386,7 +302,7 @@ def generate_ai_image(prompt: str) -> str:
                     "weight": 1.0
                 },
                 {
-                    "text": "blurry, low quality, distorted, deformed, disfigured, bad anatomy, watermark, text, logo",
+                    "text": negative_prompt,
                     "weight": -0.7
                 }
             ],
@@ -395,261 +311,379 @@ def generate_ai_image(prompt: str) -> str:
             "steps": 30
         }
 
-        # Try each endpoint until one works
-        response = None
-        success = False
-
-        for endpoint_config in endpoints_config:
+        # Reuse an identical image from any endpoint before calling upstream
+        image_cache = get_image_cache()
+        cache_keys = [
+            make_image_key(
+                enhanced_prompt,
+                negative_prompt,
+                endpoint_config["width"],
+                endpoint_config["height"],
+                endpoint_config["style_preset"],
+                base_body["cfg_scale"],
+                base_body["steps"],
+            )
+            for endpoint_config in endpoints_config
+        ]
+        if image_cache is not None:
+            with span("image_cache_lookup"):
+                for cache_key in cache_keys:
+                    cached_url = await image_cache.lookup(cache_key)
+                    if cached_url:
+                        logger.info(f"Image cache hit: {cached_url}")
+                        image_store = get_image_store()
+                        await image_store.touch(image_store.path_for_url(cached_url))
+                        return cached_url, False
+
+        async def request_endpoint(endpoint_config: dict) -> Path:
+            # Create the request body with the correct dimensions for this endpoint
+            body = base_body.copy()
+            body["width"] = endpoint_config["width"]
+            body["height"] = endpoint_config["height"]
+            body["style_preset"] = endpoint_config["style_preset"]
+
+            endpoint_url = endpoint_config["url"]
+
+            # Make the API request
+            logger.info(f"Trying endpoint: {endpoint_url}")
+            logger.debug("Request body: %s", body)
+
+            limiter = get_rate_limiter("stability")
+            breaker = get_breaker(f"stability:{endpoint_url}")
+
+            async def attempt() -> httpx.Response:
+                # Skip endpoints whose breaker is open so an outage costs no time, not even a quota wait
+                async with breaker.guard():
+                    with span("rate_limit_wait", upstream="stability"):
+                        await limiter.acquire()
+                    started = time.perf_counter()
+                    try:
+                        with span("stability", endpoint=endpoint_url) as attempt_span:
+                            # Stream the body: a 1024px artifact is several MB of base64
+                            request = client.build_request("POST", endpoint_url, headers=headers, json=body)
+                            response = await client.send(request, stream=True)
+                            if attempt_span is not None:
+                                attempt_span.set(status_code=response.status_code)
+                    except Exception as endpoint_error:
+                        record_upstream("stability", endpoint_url, time.perf_counter() - started, endpoint_error)
+                        stability_latency.record_failure(endpoint_url)
+                        logger.warning(f"Error with endpoint {endpoint_url}: {str(endpoint_error)}")
+                        raise
+
+                    # Log the response status and headers for debugging
+                    logger.info(f"Response status code: {response.status_code}")
+
+                    if response.status_code != 200:
+                        await response.aread()
+                        await response.aclose()
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        if response.status_code == 429:
+                            limiter.penalize(retry_after)
+                        stability_latency.record_failure(endpoint_url)
+                        logger.warning(f"Endpoint {endpoint_url} returned status code {response.status_code}: {response.text}")
+                        error = UpstreamHTTPError(
+                            f"Endpoint {endpoint_url} returned status code {response.status_code}",
+                            code=response.status_code,
+                            retry_after=retry_after,
+                        )
+                        record_upstream("stability", endpoint_url, time.perf_counter() - started, error)
+                        raise error
+
+                record_upstream("stability", endpoint_url, time.perf_counter() - started)
+                stability_latency.record(endpoint_url, time.perf_counter() - started)
+                return response
+
+            # Retry transient failures on this endpoint before the hedge moves on
+            response = await retry_policy.run(breaker.name, attempt)
             try:
-                # Create the request body with the correct dimensions for this endpoint
-                body = base_body.copy()
-                body["width"] = endpoint_config["width"]
-                body["height"] = endpoint_config["height"]
-                body["style_preset"] = endpoint_config["style_preset"]
-
-                endpoint_url = endpoint_config["url"]
-
-                # Make the API request
-                logger.info(f"Trying endpoint: {endpoint_url}")
-                logger.info(f"Request body: {body}")
-
-                response = requests.post(endpoint_url, headers=headers, json=body, timeout=30)
-
-                # Log the response status and headers for debugging
-                logger.info(f"Response status code: {response.status_code}")
-
-                if response.status_code == 200:
-                    logger.info(f"Successfully generated image with endpoint: {endpoint_url}")
-                    success = True
-                    break
-                else:
-                    logger.warning(f"Endpoint {endpoint_url} returned status code {response.status_code}: {response.text}")
-            except Exception as endpoint_error:
-                logger.warning(f"Error with endpoint {endpoint_config['url']}: {str(endpoint_error)}")
-                continue
-
-        if not success:
-            logger.error("All endpoints failed. Falling back to placeholder image.")
-            return create_placeholder_image(prompt)
-
-        # Try to parse the response as JSON
+                # Decode the artifact straight to disk; a malformed body lets the hedge move on
+                with span("image_decode", endpoint=endpoint_url):
+                    tmp_path = await stream_image_to_file(response, get_image_store().temp_path())
+            finally:
+                await response.aclose()
+            logger.info(f"Successfully generated image with endpoint: {endpoint_url}")
+            return tmp_path
+
+        # Try the endpoints in order, hedging with the next one if the current one is slow
         try:
-            data = response.json()
-            logger.info(f"Response data keys: {data.keys()}")
-
-            # Save the image
-            if "artifacts" in data and len(data["artifacts"]) > 0:
-                artifact = data["artifacts"][0]
-
-                if "base64" in artifact:
-                    # Decode the base64 image data
-                    image_data = base64.b64decode(artifact["base64"])
-
-                    # Generate a unique filename
-                    import time
-                    import hashlib
-                    timestamp = int(time.time())
-                    filename = f"image_{timestamp}_{hashlib.md5(prompt.encode()).hexdigest()[:8]}.png"
-                    image_path = STATIC_DIR / filename
-
-                    # Save the image
-                    with open(image_path, "wb") as f:
-                        f.write(image_data)
-
-                    logger.info(f"Successfully saved image to {image_path}")
-
-                    # Return the relative path to the image
-                    return f"/static/images/generated/{filename}"
-                else:
-                    logger.error(f"No base64 data in artifact: {artifact.keys()}")
-            else:
-                logger.error(f"No artifacts in response data: {data}")
-
-            # If we get here, something went wrong with the response format
-            return create_placeholder_image(prompt)
-
-        except ValueError as json_error:
-            # If the response is not JSON, it might be the image data directly
-            logger.warning(f"Response is not JSON, might be direct image data: {json_error}")
-
-            # Generate a unique filename
-            import time
-            import hashlib
-            timestamp = int(time.time())
-            filename = f"image_{timestamp}_{hashlib.md5(prompt.encode()).hexdigest()[:8]}.png"
-            image_path = STATIC_DIR / filename
-
-            # Save the image data directly
-            with open(image_path, "wb") as f:
-                f.write(response.content)
+            winner, tmp_path = await hedged_race(
+                [partial(request_endpoint, endpoint_config) for endpoint_config in endpoints_config],
+                lambda index: stability_hedge_delay(endpoints_config[index]["url"]),
+                discard=lambda unused_path: unused_path.unlink(missing_ok=True),
+            )
+        except Exception:
+            logger.error("All endpoints failed. Falling back to placeholder image.")
+            return await create_placeholder_image(prompt), True
 
-            logger.info(f"Saved direct image data to {image_path}")
+        # Save the image under its content-addressed name
+        image_url = await save_generated_image(tmp_path, cache_keys[winner], image_cache)
+        logger.info(f"Successfully saved image to {image_url}")
 
-            # Return the relative path to the image
-            return f"/static/images/generated/{filename}"
+        # Return the relative path to the image
+        return image_url, False
 
     except Exception as e:
         logger.error(f"Error generating image: {str(e)}")
         logger.exception("Full exception details:")
-        return create_placeholder_image(prompt)
-
-def create_placeholder_image(prompt: str) -> str:
-    """Generate a placeholder image with text when API is not available."""
-    try:
-        # Import necessary libraries
-        from PIL import Image, ImageDraw, ImageFont
-        import time
-        import hashlib
-        import os
-
-        # Log the static directory path
-        logger.info(f"Static directory path: {STATIC_DIR}")
+        return await create_placeholder_image(prompt), True
 
-        # Ensure the directory exists
-        os.makedirs(STATIC_DIR, exist_ok=True)
+# Placeholder renders coalesced by file name; renders beyond the cap get the generic image
+placeholder_renders = SingleFlight()
+GENERIC_PLACEHOLDER_PROMPT = ""
+EMERGENCY_PLACEHOLDER_FILENAME = "placeholder_emergency.png"
 
-        # Create a unique filename
-        timestamp = int(time.time())
-        filename = f"placeholder_{timestamp}_{hashlib.md5(prompt.encode()).hexdigest()[:8]}.png"
-        image_path = STATIC_DIR / filename
+async def create_placeholder_image(prompt: str) -> Optional[str]:
+    """Generate a placeholder image with text when API is not available.
 
-        # Log the full image path
-        logger.info(f"Creating placeholder image at: {image_path}")
-
-        # Create a simple colored image for testing
-        try:
-            # Create a simple colored rectangle
-            width, height = 800, 600
-            image = Image.new('RGB', (width, height), (200, 200, 240))  # Light blue-gray
-
-            # Draw some shapes for visual interest
-            draw = ImageDraw.Draw(image)
+    Placeholders are memoized in the image store by prompt text, so during
+    an outage each distinct prompt is drawn once. Drawing happens in the
+    render pool; if more than ``PLACEHOLDER_MAX_PENDING_RENDERS`` distinct
+    prompts are waiting, the shared generic placeholder is returned instead.
+    """
+    record_fallback("placeholder_image")
+    image_store = get_image_store()
 
-            # Draw a border
-            draw.rectangle([(0, 0), (width-1, height-1)], outline=(100, 100, 180), width=10)
+    # The name depends only on the prompt, so repeats reuse one file
+    filename = f"placeholder_{hashlib.sha256(prompt.encode()).hexdigest()[:16]}.png"
+    image_path = image_store.path_for(filename)
+    if image_path.exists():
+        await image_store.touch(image_path)
+        return image_store.url_for(image_path)
 
-            # Draw some rectangles
-            draw.rectangle([(50, 50), (width-50, height-50)], outline=(150, 150, 210), width=5)
+    if prompt != GENERIC_PLACEHOLDER_PROMPT and len(placeholder_renders.waiters()) >= settings.PLACEHOLDER_MAX_PENDING_RENDERS:
+        logger.warning("Too many placeholder renders pending; using the generic placeholder")
+        return await create_placeholder_image(GENERIC_PLACEHOLDER_PROMPT)
 
-            # Draw a circle
-            draw.ellipse([(width//4, height//4), (3*width//4, 3*height//4)], outline=(100, 100, 180), width=5)
+    return await placeholder_renders.do(filename, lambda: _save_placeholder_image(prompt, filename))
 
-            # Add text
-            try:
-                # Try to use a system font
-                font = None
-                system_fonts = ["Arial.ttf", "Verdana.ttf", "Tahoma.ttf", "calibri.ttf"]
+async def _save_placeholder_image(prompt: str, filename: str) -> Optional[str]:
+    with span("placeholder_render"):
+        try:
+            image_data = await run_render(render_placeholder, prompt)
+        except Exception as e:
+            logger.error(f"Error creating placeholder image: {str(e)}")
+            # Stored under its own name, so the prompt is drawn properly next time
+            filename = EMERGENCY_PLACEHOLDER_FILENAME
+            image_data = render_simple_placeholder()
 
-                for font_name in system_fonts:
-                    try:
-                        font = ImageFont.truetype(font_name, 36)
-                        logger.info(f"Successfully loaded font: {font_name}")
-                        break
-                    except Exception:
-                        continue
+    try:
+        image_store = get_image_store()
+        image_path = await image_store.write_bytes(filename, image_data)
+    except Exception as e:
+        logger.error(f"Error saving placeholder image: {str(e)}")
+        return None
+    generated_image_bytes.labels("placeholder").inc(len(image_data))
+
+    image_url = image_store.url_for(image_path)
+    logger.info(f"Returning image URL: {image_url}")
+    return image_url
+
+async def warm_placeholder_pool():
+    """Load the placeholder font and canvas in a render process."""
+    await run_render(warm_placeholder_renderer)
+
+def build_image_prompt(request: SocialContentRequest) -> str:
+    """Return the requested image prompt, or build one from the product details."""
+    if request.image_prompt:
+        return request.image_prompt
+
+    # Use product details to create a default image prompt
+    product_desc = f"{request.product_name}" if request.product_name else request.content_title
+    category_desc = f" {request.product_category}" if request.product_category else ""
+
+    # Clean up key features to remove any quotes
+    clean_features = []
+    if request.key_features and len(request.key_features) > 0:
+        for feature in request.key_features[:2]:
+            clean_feature = feature.replace('"', '').replace("'", "").strip()
+            if clean_feature:
+                clean_features.append(clean_feature)
+
+    features_desc = ""
+    if clean_features:
+        features_desc = f" with {', '.join(clean_features)}"
+
+    return f"Professional product photo of {product_desc}{category_desc}{features_desc}, white background, studio lighting, high quality, detailed"
+
+async def generate_text_with_timeout(request: SocialContentRequest, fallback_content: Optional[str] = None) -> str:
+    """Generate the post text, falling back to template copy if it takes too long."""
+    with span("text"):
+        try:
+            return await asyncio.wait_for(generate_social_content(request, fallback_content), timeout=settings.SOCIAL_TEXT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Text generation timed out after {settings.SOCIAL_TEXT_TIMEOUT_SECONDS}s. Using fallback.")
+            return generate_fallback_content(request)
 
-                if font is None:
-                    logger.warning("Using default font")
-                    font = ImageFont.load_default()
+async def generate_image_with_timeout(image_prompt: str, http_client: httpx.AsyncClient) -> Tuple[Optional[str], bool]:
+    """Generate the post image, giving up after ``SOCIAL_IMAGE_TIMEOUT_SECONDS``.
 
-                # Add title text
-                title = "Test Image"
-                draw.text((width//2 - 100, 100), title, fill=(50, 50, 100), font=font)
+    The shared generation keeps running after a timeout, so its result still
+    reaches the image cache for the next request.
+    """
+    with span("image"):
+        return await asyncio.wait_for(generate_ai_image(image_prompt, http_client), timeout=settings.SOCIAL_IMAGE_TIMEOUT_SECONDS)
 
-                # Add prompt text
-                prompt_text = f"Prompt: {prompt[:50]}..."
-                draw.text((width//2 - 200, height//2), prompt_text, fill=(50, 50, 100), font=font)
+async def build_social_response(request: SocialContentRequest, http_client: httpx.AsyncClient, fallback_content: Optional[str] = None) -> dict:
+    """Generate the text content and, if requested, the image for one request.
 
-            except Exception as text_error:
-                logger.error(f"Error adding text: {str(text_error)}")
+    The image prompt only depends on request fields, so text and image are
+    generated concurrently, each with its own timeout. If the image fails the
+    text is still returned, with ``image_error`` set. Per-platform crops of a
+    generated image (not of a placeholder) are listed under ``image_variants``.
+    A pre-rendered ``fallback_content`` is used as the text unless it is cached.
+    """
+    image_task = None
+    image_prompt = None
+    image_job_id = None
 
-            # Save the image
-            image.save(image_path)
-            logger.info(f"Successfully saved test image to {image_path}")
+    # Hand the image to a background worker if the client will poll for it
+    if request.generate_image and request.async_image:
+        image_prompt = build_image_prompt(request)
+        try:
+            job = await image_jobs.submit(image_prompt, lambda: generate_ai_image_url(image_prompt, http_client))
+            image_job_id = job.id
+        except (asyncio.QueueFull, RuntimeError) as job_error:
+            logger.error(f"Could not queue image job: {str(job_error)}")
 
-            # Return the URL path to the image
-            image_url = f"/static/images/generated/{filename}"
-            logger.info(f"Returning image URL: {image_url}")
-            return image_url
+    # Otherwise start the image alongside the text
+    elif request.generate_image:
+        image_prompt = build_image_prompt(request)
+        logger.info(f"Generating image with prompt: {image_prompt}")
+        image_task = asyncio.create_task(generate_image_with_timeout(image_prompt, http_client))
 
+    try:
+        content = await generate_text_with_timeout(request, fallback_content)
+    except BaseException:
+        if image_task is not None:
+            image_task.cancel()
+        raise
+    response_data = {"message": content, "platform": request.platform}
+
+    if image_job_id is not None:
+        response_data["image_job_id"] = image_job_id
+        response_data["image_prompt"] = image_prompt
+
+    elif image_task is not None:
+        try:
+            image_path, is_placeholder = await image_task
+            logger.info(f"Generated image path: {image_path}")
+
+            # Add image data to response if successful
+            if image_path:
+                response_data["image_url"] = image_path
+                response_data["image_prompt"] = image_prompt
+                logger.info(f"Image path added to response: {image_path}")
+                if settings.IMAGE_DERIVATIVES_ENABLED and not is_placeholder:
+                    try:
+                        response_data["image_variants"] = await asyncio.wait_for(
+                            create_image_variants(image_path, request.platform),
+                            timeout=settings.IMAGE_DERIVATIVE_TIMEOUT_SECONDS,
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Image variants timed out after {settings.IMAGE_DERIVATIVE_TIMEOUT_SECONDS}s")
+                    except Exception as variant_error:
+                        logger.error(f"Error creating image variants: {str(variant_error)}")
+            else:
+                logger.warning("Image generation returned None")
+        except asyncio.TimeoutError:
+            logger.error(f"Image generation timed out after {settings.SOCIAL_IMAGE_TIMEOUT_SECONDS}s")
+            response_data["image_error"] = "Image generation timed out"
         except Exception as img_error:
-            logger.error(f"Error creating test image: {str(img_error)}")
-            raise
-
-    except Exception as e:
-        logger.error(f"Error generating placeholder image: {str(e)}")
-        # Return a hardcoded test image path for debugging
-        test_image = "/static/images/generated/test_image.png"
-
-        # Try to create a very simple test image
+            # Log the error but continue with text content
+            logger.error(f"Error during image generation: {str(img_error)}")
+            response_data["image_error"] = "Image generation failed"
+
+    return response_data
+
+async def run_batch_item(
+    index: int,
+    request: SocialContentRequest,
+    semaphore: asyncio.Semaphore,
+    http_client: httpx.AsyncClient,
+    fallback_content: Optional[str] = None,
+) -> dict:
+    """Generate one batch item, capturing any error in the item result."""
+    # Batch items queue behind interactive requests for upstream quota
+    request_priority.set(BULK)
+    async with semaphore:
         try:
-            simple_image = Image.new('RGB', (400, 300), (255, 0, 0))  # Red rectangle
-            simple_image.save(STATIC_DIR / "test_image.png")
-            logger.info("Created fallback test image")
-        except Exception as simple_error:
-            logger.error(f"Error creating simple test image: {str(simple_error)}")
-
-        return test_image
+            result = await build_social_response(request, http_client, fallback_content)
+            return {"index": index, "status": "ok", "result": result}
+        except HTTPException as e:
+            return {"index": index, "status": "error", "error": e.detail}
+        except Exception as e:
+            logger.error(f"Error in batch item {index}: {str(e)}")
+            return {"index": index, "status": "error", "error": str(e)}
 
 # Define the API endpoints
 @router.post("/social_content")
-async def create_social_content(request: SocialContentRequest):
+async def create_social_content(request: SocialContentRequest, http_client: httpx.AsyncClient = Depends(get_http_client)):
     """Endpoint to generate social media content using AI."""
     try:
-        # First generate the text content
-        content = generate_social_content(request)
-        response_data = {"message": content, "platform": request.platform}
-
-        # Generate image if requested
-        if request.generate_image:
-            try:
-                # Create image prompt if not provided
-                image_prompt = request.image_prompt
-                if not image_prompt:
-                    # Use product details to create a default image prompt
-                    product_desc = f"{request.product_name}" if request.product_name else request.content_title
-                    category_desc = f" {request.product_category}" if request.product_category else ""
-
-                    # Clean up key features to remove any quotes
-                    clean_features = []
-                    if request.key_features and len(request.key_features) > 0:
-                        for feature in request.key_features[:2]:
-                            clean_feature = feature.replace('"', '').replace("'", "").strip()
-                            if clean_feature:
-                                clean_features.append(clean_feature)
-
-                    features_desc = ""
-                    if clean_features:
-                        features_desc = f" with {', '.join(clean_features)}"
-
-                    image_prompt = f"Professional product photo of {product_desc}{category_desc}{features_desc}, white background, studio lighting, high quality, detailed"
-
-                # Generate the image
-                logger.info(f"Generating image with prompt: {image_prompt}")
-
-                # Use the Stability AI API for image generation
-                image_path = generate_ai_image(image_prompt)
-                logger.info(f"Generated image path: {image_path}")
-
-                # Add image data to response if successful
-                if image_path:
-                    response_data["image_url"] = image_path
-                    response_data["image_prompt"] = image_prompt
-                    logger.info(f"Image path added to response: {image_path}")
-                else:
-                    logger.warning("Image generation returned None")
-            except Exception as img_error:
-                # Log the error but continue with text content
-                logger.error(f"Error during image generation: {str(img_error)}")
-                # We don't add image data to the response, but we still return the text content
-
-        return response_data
+        return await build_social_response(request, http_client)
     except HTTPException as e:
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
     except Exception as e:
         logger.error(f"Unexpected error in create_social_content: {str(e)}")
         return JSONResponse(status_code=500, content={"detail": f"An error occurred: {str(e)}"})
 
+@router.post("/social_content/batch")
+async def create_social_content_batch(batch: SocialContentBatchRequest, http_client: httpx.AsyncClient = Depends(get_http_client)):
+    """Endpoint to generate social media content for many requests at once.
+
+    Items run concurrently up to ``BATCH_MAX_CONCURRENCY``. A failing item is
+    reported in its own result and never fails the batch. With ``stream`` set,
+    results are emitted as NDJSON lines in completion order.
+    """
+    if len(batch.items) > settings.BATCH_MAX_ITEMS:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": f"A batch may contain at most {settings.BATCH_MAX_ITEMS} items"}
+        )
+
+    # While Gemini's breaker is open every item would fall back, so render all their text in one call
+    fallback_contents: List[Optional[str]] = [None] * len(batch.items)
+    if get_breaker(gemini_breaker_name_for(settings.GEMINI_MODEL_NAME)).is_rejecting():
+        logger.warning("Gemini circuit breaker is open; using fallback text for the batch")
+        # Counted as fallbacks only where used; cached items still get their cached text
+        fallback_contents = render_social_many(batch.items)
+
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    tasks = [
+        asyncio.ensure_future(run_batch_item(index, item, semaphore, http_client, fallback_content))
+        for index, (item, fallback_content) in enumerate(zip(batch.items, fallback_contents))
+    ]
+
+    if batch.stream:
+        async def ndjson_results():
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    yield json.dumps(await next_result, ensure_ascii=False) + "\n"
+            finally:
+                # Stop outstanding work if the client goes away
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(ndjson_results(), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*tasks)
+    succeeded = sum(1 for result in results if result["status"] == "ok")
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
+@router.post("/social_content/stream")
+async def stream_social_content(request: SocialContentRequest):
+    """Endpoint to stream social media text content as Server-Sent Events."""
+    model = clients.model(settings.GEMINI_MODEL_NAME, generation_config)
+    return sse_response(stream_generation(
+        model,
+        build_social_prompt(request),
+        fallback=lambda: generate_fallback_content(request),
+        cache=get_response_cache(),
+        cache_endpoint="social",
+        cache_key=build_social_cache_key(request),
+        summary={"platform": request.platform},
+    ))
+
 # Keep the GET endpoint for backward compatibility
 @router.get("/social_content")
 async def get_social_content(
@@ -664,7 +698,9 @@ async def get_social_content(
     include_hashtags: Optional[bool] = True,
     include_emojis: Optional[bool] = True,
     generate_image: Optional[bool] = False,
-    image_prompt: Optional[str] = None
+    image_prompt: Optional[str] = None,
+    async_image: Optional[bool] = False,
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ):
     """Endpoint to generate social media content using AI (GET method)."""
     try:
@@ -686,58 +722,29 @@ async def get_social_content(
             include_hashtags=include_hashtags,
             include_emojis=include_emojis,
             generate_image=generate_image,
-            image_prompt=image_prompt
+            image_prompt=image_prompt,
+            async_image=async_image
         )
 
-        # First generate the text content
-        content = generate_social_content(request)
-        response_data = {"message": content, "platform": platform}
-
-        # Generate image if requested
-        if generate_image:
-            try:
-                # Create image prompt if not provided
-                if not image_prompt:
-                    # Use product details to create a default image prompt
-                    product_desc = f"{product_name}" if product_name else content_title
-                    category_desc = f" {product_category}" if product_category else ""
-
-                    # Clean up key features to remove any quotes
-                    clean_features = []
-                    if key_features_list and len(key_features_list) > 0:
-                        for feature in key_features_list[:2]:
-                            clean_feature = feature.replace('"', '').replace("'", "").strip()
-                            if clean_feature:
-                                clean_features.append(clean_feature)
-
-                    features_desc = ""
-                    if clean_features:
-                        features_desc = f" with {', '.join(clean_features)}"
-
-                    image_prompt = f"Professional product photo of {product_desc}{category_desc}{features_desc}, white background, studio lighting, high quality, detailed"
-
-                # Generate the image
-                logger.info(f"Generating image with prompt: {image_prompt}")
-
-                # Use the Stability AI API for image generation
-                image_path = generate_ai_image(image_prompt)
-                logger.info(f"Generated image path: {image_path}")
-
-                # Add image data to response if successful
-                if image_path:
-                    response_data["image_url"] = image_path
-                    response_data["image_prompt"] = image_prompt
-                    logger.info(f"Image path added to response: {image_path}")
-                else:
-                    logger.warning("Image generation returned None")
-            except Exception as img_error:
-                # Log the error but continue with text content
-                logger.error(f"Error during image generation: {str(img_error)}")
-                # We don't add image data to the response, but we still return the text content
-
-        return response_data
+        return await build_social_response(request, http_client)
     except HTTPException as e:
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
     except Exception as e:
         logger.error(f"Unexpected error in get_social_content: {str(e)}")
         return JSONResponse(status_code=500, content={"detail": f"An error occurred: {str(e)}"})
+
+async def warm_stability_connections():
+    """Open pooled connections to Stability so the first image request skips DNS and TLS setup."""
+    if not settings.STABILITY_API_KEY:
+        return
+    headers = {"Authorization": f"Bearer {settings.STABILITY_API_KEY}"}
+    # One connection per endpoint the hedge may use concurrently
+    await asyncio.gather(*(
+        clients.http_client.get(STABILITY_WARMUP_URL, headers=headers)
+        for _ in range(STABILITY_WARMUP_CONNECTIONS)
+    ))
+
+clients.declare_model(settings.GEMINI_MODEL_NAME, generation_config)
+warmup.register("placeholder_renderer", warm_placeholder_pool)
+warmup.register("stability_connections", warm_stability_connections)
+warmup.register_replay("social", lambda payload: generate_social_content(SocialContentRequest(**payload)))
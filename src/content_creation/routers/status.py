@@ -0,0 +1,60 @@
+import asyncio
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from ..utils.cache import get_response_cache
+from ..utils.circuit_breaker import breaker_states
+from ..utils.image_jobs import image_jobs
+from ..utils.image_store import get_image_store
+from ..utils.rate_limiter import rate_limiter_states
+from ..utils.retry import retry_policy
+from ..utils.single_flight import single_flight
+from ..utils.warmup import warmup
+from .social_content import stability_latency
+
+router = APIRouter()
+
+@router.get("/status/cache")
+async def get_cache_status():
+    """Return response cache size and hit/miss counters."""
+    return get_response_cache().stats()
+
+@router.get("/status/single_flight")
+async def get_single_flight_status():
+    """Return in-flight coalesced generations and their waiter counts."""
+    return single_flight.stats()
+
+@router.get("/status/image_jobs")
+async def get_image_jobs_status():
+    """Return image job queue depth and worker counts."""
+    return image_jobs.stats()
+
+@router.get("/status/image_store")
+async def get_image_store_status():
+    """Return image store usage against its size and age limits."""
+    return await asyncio.to_thread(get_image_store().stats)
+
+@router.get("/status/stability")
+async def get_stability_status():
+    """Return per-endpoint Stability latency percentiles and failure counts."""
+    return stability_latency.snapshot()
+
+@router.get("/status/breakers")
+async def get_breaker_status():
+    """Return the state of every upstream circuit breaker."""
+    return breaker_states()
+
+@router.get("/status/rate_limits")
+async def get_rate_limit_status():
+    """Return the effective budgets and queue depths of the upstream rate limiters."""
+    return rate_limiter_states()
+
+@router.get("/status/retries")
+async def get_retry_status():
+    """Return per-upstream retry counters and the global retry budget."""
+    return retry_policy.stats()
+
+@router.get("/status/ready")
+async def get_readiness():
+    """Readiness probe: 503 until the worker has finished warming up."""
+    status = warmup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
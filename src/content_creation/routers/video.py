@@ -2,27 +2,27 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 import logging
 from typing import Optional
-import google.generativeai as genai
 from ..config.settings import settings
+from ..utils.cache import get_response_cache, make_cache_key
+from ..utils.clients import clients
+from ..utils.generation import generate_content
+from ..utils.single_flight import single_flight
+from ..utils.sse import sse_response, stream_generation
+from ..utils.tracing import span
+from ..utils.warmup import warmup
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Basic Gemini configuration
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
 class VideoConceptRequest(BaseModel):
     title: str = Field(..., min_length=3, max_length=100)
     duration: int = Field(default=30, ge=10, le=300)
     purpose: Optional[str] = Field(default="Product Demo Ad")
     target_audience: Optional[str] = Field(default="General audience")
 
-def generate_video_script(title: str, duration: int) -> str:
-    """Generate video script using Gemini API."""
-    try:
-        model = genai.GenerativeModel("gemini-pro")
-        
-        prompt = f'''Create a {duration}-second video script for: "{title}"
+def build_video_prompt(title: str, duration: int) -> str:
+    """Build the Gemini prompt for a video script."""
+    return f'''Create a {duration}-second video script for: "{title}"
 
 Please provide:
 1. Scene-by-scene breakdown with timestamps
@@ -38,10 +38,49 @@ Scene [X] ([timestamp])
 - Text: [on-screen text]
 - Transition: [type]'''
 
-        response = model.generate_content(prompt)
+def build_video_cache_key(title: str, duration: int) -> str:
+    """Build the response cache key for a video script request."""
+    return make_cache_key(
+        "video",
+        {"title": title, "duration": duration},
+        settings.GEMINI_MODEL_NAME,
+        None,
+    )
+
+def validate_video_params(video_title: str, duration: int) -> str:
+    """Validate video query parameters and return the cleaned title."""
+    title = video_title.strip()
+    if not title:
+        raise HTTPException(status_code=400, detail="Video title is required")
+
+    if duration < 10 or duration > 300:
+        raise HTTPException(
+            status_code=400,
+            detail="Duration must be between 10 and 300 seconds"
+        )
+    return title
+
+async def generate_video_script(title: str, duration: int) -> str:
+    """Generate video script using Gemini API."""
+    cache = get_response_cache()
+    cache_key = build_video_cache_key(title, duration)
+    with span("cache_lookup", endpoint="video"):
+        cached = await cache.get("video", cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        model = clients.model(settings.GEMINI_MODEL_NAME)
+        with span("prompt_build"):
+            prompt = build_video_prompt(title, duration)
+
+        # Share one upstream call between identical concurrent requests
+        response = await single_flight.do(cache_key, lambda: generate_content(model, prompt))
         
         if response and hasattr(response, 'text'):
-            return response.text.strip()
+            script = response.text.strip()
+            await cache.set("video", cache_key, script)
+            return script
         else:
             raise Exception("Failed to generate response")
             
@@ -54,18 +93,10 @@ async def get_videos(video_title: str, duration: int):
     """Handle GET requests for video generation."""
     try:
         # Input validation
-        title = video_title.strip()
-        if not title:
-            raise HTTPException(status_code=400, detail="Video title is required")
-            
-        if duration < 10 or duration > 300:
-            raise HTTPException(
-                status_code=400,
-                detail="Duration must be between 10 and 300 seconds"
-            )
+        title = validate_video_params(video_title, duration)
         
         # Generate script
-        script = generate_video_script(title, duration)
+        script = await generate_video_script(title, duration)
         
         return {
             "video_title": title,
@@ -83,3 +114,30 @@ async def get_videos(video_title: str, duration: int):
             status_code=500,
             detail="Failed to generate video concept. Please try again."
         )
+
+
+@router.get("/videos/stream")
+async def stream_videos(video_title: str, duration: int):
+    """Stream a generated video script as Server-Sent Events."""
+    title = validate_video_params(video_title, duration)
+    model = clients.model(settings.GEMINI_MODEL_NAME)
+    return sse_response(stream_generation(
+        model,
+        build_video_prompt(title, duration),
+        cache=get_response_cache(),
+        cache_endpoint="video",
+        cache_key=build_video_cache_key(title, duration),
+        summary={
+            "video_title": title,
+            "duration": f"{duration} seconds",
+            "purpose": "Product Demo Ad",
+            "target_audience": "General audience",
+        },
+    ))
+
+
+clients.declare_model(settings.GEMINI_MODEL_NAME)
+warmup.register_replay("video", lambda payload: generate_video_script(
+    validate_video_params(payload["video_title"], payload["duration"]),
+    payload["duration"],
+))
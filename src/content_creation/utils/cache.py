@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize request values so trivially different briefs share a key."""
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    return value
+
+
+def make_cache_key(endpoint: str, payload: Dict[str, Any], model_name: str, generation_config: Optional[Dict[str, Any]]) -> str:
+    """Build a content-addressed key from the normalized request and model settings."""
+    material = {
+        "endpoint": endpoint,
+        "payload": _normalize(payload),
+        "model": model_name,
+        "generation_config": generation_config or {},
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class DiskCacheBackend:
+    """Stores cache entries as small JSON files sharded by key prefix."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+        if entry["expires_at"] < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return entry["expires_at"], entry["value"]
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": expires_at, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*/*.json"):
+            path.unlink(missing_ok=True)
+
+
+class ResponseCache:
+    """In-memory LRU/TTL cache for generated text with an optional disk backend.
+
+    Memory hits are served without leaving the event loop; disk lookups run
+    in a worker thread. Only successful upstream generations should be stored.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, backend: Optional[DiskCacheBackend] = None, disabled_endpoints: Optional[list] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.disabled_endpoints = set(disabled_endpoints or [])
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+        self._evictions = 0
+
+    def enabled_for(self, endpoint: str) -> bool:
+        return self.max_entries > 0 and endpoint not in self.disabled_endpoints
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_memory(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    async def get(self, endpoint: str, key: str) -> Optional[str]:
+        """Return the cached value for ``key`` or None on a miss."""
+        if not self.enabled_for(endpoint):
+            return None
+        value = self._get_memory(key)
+        if value is None and self.backend is not None:
+            entry = await asyncio.to_thread(self.backend.get, key)
+            if entry is not None:
+                expires_at, value = entry
+                self._set_memory(key, value, expires_at)
+        if value is None:
+            self._misses[endpoint] += 1
+        else:
+            self._hits[endpoint] += 1
+        return value
+
+    async def set(self, endpoint: str, key: str, value: str) -> None:
+        """Store ``value`` under ``key`` for the configured TTL."""
+        if not self.enabled_for(endpoint):
+            return
+        expires_at = time.time() + self.ttl_seconds
+        self._set_memory(key, value, expires_at)
+        if self.backend is not None:
+            try:
+                await asyncio.to_thread(self.backend.set, key, value, expires_at)
+            except OSError as e:
+                logger.warning(f"Failed to persist cache entry: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = sorted(set(self._hits) | set(self._misses))
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "backend": "disk" if self.backend is not None else "memory",
+            "evictions": self._evictions,
+            "hits": sum(self._hits.values()),
+            "misses": sum(self._misses.values()),
+            "endpoints": {
+                endpoint: {"hits": self._hits[endpoint], "misses": self._misses[endpoint]}
+                for endpoint in endpoints
+            },
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache configured from Settings."""
+    global _response_cache
+    if _response_cache is None:
+        backend = None
+        if settings.CACHE_BACKEND == "disk":
+            backend = DiskCacheBackend(settings.CACHE_DIR)
+        max_entries = settings.CACHE_MAX_ENTRIES if settings.CACHE_ENABLED else 0
+        _response_cache = ResponseCache(
+            max_entries=max_entries,
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+            backend=backend,
+            disabled_endpoints=settings.CACHE_DISABLED_ENDPOINTS,
+        )
+    return _response_cache
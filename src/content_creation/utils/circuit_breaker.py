@@ -0,0 +1,153 @@
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Tuple
+
+from ..config.settings import settings
+from .exceptions import CircuitOpenError, RateLimitExceededError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one upstream.
+
+    Closed: calls pass and outcomes are recorded over a rolling window; once
+    at least ``min_calls`` have been seen and the failure rate reaches
+    ``failure_rate_threshold`` the breaker opens. Open: calls are rejected
+    immediately for ``open_seconds``. Half-open: up to ``half_open_probes``
+    calls go through; a success closes the breaker, a failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_rate_threshold: float, min_calls: int, window_seconds: float, open_seconds: float, half_open_probes: int):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._probes_in_flight = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit breaker {self.name}: {self.state} -> {state}")
+            self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        if state == CLOSED:
+            self._outcomes.clear()
+        self._probes_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go through now, reserving a probe slot when half-open."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def is_rejecting(self) -> bool:
+        """Return True while the breaker is open and would reject a call, without reserving a probe."""
+        return self.state == OPEN and time.monotonic() - self.opened_at < self.open_seconds
+
+    def record_success(self) -> None:
+        if self.state == HALF_OPEN:
+            self._transition(CLOSED)
+            return
+        self._outcomes.append((time.monotonic(), True))
+
+    def record_failure(self) -> None:
+        if self.state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        now = time.monotonic()
+        self._outcomes.append((now, False))
+        self._trim(now)
+        if len(self._outcomes) >= self.min_calls and self.failure_rate() >= self.failure_rate_threshold:
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back a probe slot for a call that ended without an outcome (e.g. cancelled)."""
+        if self.state == HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / len(self._outcomes)
+
+    @asynccontextmanager
+    async def guard(self):
+        """Run the enclosed call through the breaker, raising CircuitOpenError if it is open."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit breaker {self.name} is open")
+        try:
+            yield
+        except RateLimitExceededError:
+            # The call never reached upstream, so it says nothing about its health
+            self.release()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            self.record_success()
+
+    def status(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        status = {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate(), 3),
+            "calls_in_window": len(self._outcomes),
+            "rejected": self.rejected,
+        }
+        if self.state == OPEN:
+            status["retry_in_seconds"] = round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 1)
+        return status
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the breaker for upstream ``name``, creating it from Settings on first use."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            name,
+            failure_rate_threshold=settings.BREAKER_FAILURE_RATE_THRESHOLD,
+            min_calls=settings.BREAKER_MIN_CALLS,
+            window_seconds=settings.BREAKER_WINDOW_SECONDS,
+            open_seconds=settings.BREAKER_OPEN_SECONDS,
+            half_open_probes=settings.BREAKER_HALF_OPEN_PROBES,
+        )
+        _breakers[name] = breaker
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.status() for name, breaker in sorted(_breakers.items())}
@@ -0,0 +1,99 @@
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+from ..config.settings import settings
+from .http_client import create_http_client
+from .warmup import warmup
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ClientRegistry:
+    """Owns the upstream clients for the process.
+
+    ``google.generativeai`` is imported and configured on first use rather
+    than at import time, so starting a worker doesn't pay for the SDK until a
+    request (or the lifespan warm-up) needs it. ``GenerativeModel`` objects
+    are cached per model name and generation config. The pooled HTTP client
+    is created and closed by the app lifespan via ``start``/``aclose``.
+    """
+
+    def __init__(self):
+        self._genai = None
+        self._models: Dict[Tuple[str, Hashable], Any] = {}
+        self._declared: Dict[Tuple[str, Hashable], Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def genai(self) -> Any:
+        """Return the configured ``google.generativeai`` module, importing it on first use."""
+        if self._genai is None:
+            with self._lock:
+                if self._genai is None:
+                    import google.generativeai as genai
+
+                    genai.configure(api_key=settings.GEMINI_API_KEY)
+                    logger.info("Gemini API configured")
+                    self._genai = genai
+        return self._genai
+
+    def model(self, model_name: Optional[str] = None, generation_config: Optional[Dict[str, Any]] = None) -> Any:
+        """Return a shared ``GenerativeModel`` for this name and generation config."""
+        model_name = model_name or settings.GEMINI_MODEL_NAME
+        key = (model_name, _freeze(generation_config))
+        model = self._models.get(key)
+        if model is None:
+            genai = self.genai()
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    model = genai.GenerativeModel(model_name=model_name, generation_config=generation_config)
+                    self._models[key] = model
+        return model
+
+    def declare_model(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None) -> None:
+        """Record a model configuration for ``warm_models`` to build ahead of the first request."""
+        self._declared[(model_name, _freeze(generation_config))] = generation_config
+
+    def warm_models(self) -> None:
+        """Construct every declared model and open the Gemini connection (blocking)."""
+        model = None
+        for (model_name, _), generation_config in list(self._declared.items()):
+            model = self.model(model_name, generation_config)
+        if model is not None:
+            # A token count is a cheap authenticated call that sets up the transport and TLS session
+            model.count_tokens("warm-up")
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            raise RuntimeError("HTTP client used before the application started")
+        return self._http_client
+
+    def start(self) -> None:
+        """Create the pooled HTTP client; called once from the app lifespan."""
+        if self._http_client is None:
+            self._http_client = create_http_client()
+
+    async def aclose(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+
+# Process-wide client registry
+clients = ClientRegistry()
+
+# Build the declared models and open the Gemini connection during warm-up
+warmup.register("gemini_models", clients.warm_models)
@@ -13,3 +13,18 @@ class GeminiAPIError(APIError):
 class ConfigurationError(APIError):
     """Exception raised for configuration-related errors."""
     pass
+
+class CircuitOpenError(APIError):
+    """Exception raised when an upstream's circuit breaker is open."""
+    pass
+
+class RateLimitExceededError(APIError):
+    """Exception raised when a request waits past its rate limiter queue deadline."""
+    pass
+
+class UpstreamHTTPError(APIError):
+    """Exception raised when an upstream HTTP API returns an error status."""
+    def __init__(self, message: str, code: int, retry_after: float = None):
+        super().__init__(message)
+        self.code = code
+        self.retry_after = retry_after
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Optional
+
+from ..config.settings import settings
+from .circuit_breaker import get_breaker
+from .metrics import record_upstream
+from .rate_limiter import get_rate_limiter, is_rate_limit_error
+from .retry import retry_policy
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Shared executor for blocking Gemini SDK calls. The SDK's generate_content is
+# synchronous, so every call is pushed off the event loop into this pool.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared generation executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.GENERATION_MAX_WORKERS,
+            thread_name_prefix="generation",
+        )
+        logger.info(f"Generation executor started with {settings.GENERATION_MAX_WORKERS} workers")
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared generation executor."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def gemini_model_name(model: Any) -> str:
+    return getattr(model, "model_name", "unknown")
+
+
+def gemini_breaker_name(model: Any) -> str:
+    """Return the circuit breaker name for a Gemini model object."""
+    return gemini_breaker_name_for(gemini_model_name(model))
+
+
+def gemini_breaker_name_for(model_name: str) -> str:
+    """Return the circuit breaker name for a configured model name, without building the model."""
+    # The SDK reports bare names with a "models/" prefix
+    if "/" not in model_name and model_name != "unknown":
+        model_name = f"models/{model_name}"
+    return f"gemini:{model_name}"
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Roughly estimate the tokens a call will consume for the tokens-per-minute budget."""
+    return len(prompt) // 4 + settings.GEMINI_OUTPUT_TOKENS_ESTIMATE
+
+
+async def generate_content(model: Any, prompt: str, **kwargs: Any) -> Any:
+    """Run ``model.generate_content`` without blocking the event loop.
+
+    At most ``GENERATION_MAX_WORKERS`` calls run at once; additional calls
+    queue in the executor. The timeout is also passed to the SDK so the
+    worker thread is freed. Raises ``asyncio.TimeoutError`` if an attempt
+    takes longer than ``GENERATION_TIMEOUT_SECONDS`` or the call, retries
+    included, runs past ``GENERATION_DEADLINE_SECONDS``, and ``CircuitOpenError``
+    without calling upstream or waiting for quota while the model's circuit
+    breaker is open. Calls then wait for the shared Gemini rate limiter, and
+    a 429 tightens it.
+    Transient failures are retried by the shared retry policy.
+    """
+    loop = asyncio.get_running_loop()
+    kwargs.setdefault("request_options", {"timeout": settings.GENERATION_TIMEOUT_SECONDS})
+    call = partial(model.generate_content, prompt, **kwargs)
+    limiter = get_rate_limiter("gemini")
+    model_name = gemini_model_name(model)
+    breaker_name = gemini_breaker_name(model)
+    deadline = loop.time() + settings.GENERATION_DEADLINE_SECONDS
+
+    async def attempt() -> Any:
+        # Check the breaker first so an outage fails fast instead of queueing for quota
+        async with get_breaker(breaker_name).guard():
+            with span("rate_limit_wait", upstream="gemini"):
+                await limiter.acquire(estimate_tokens(prompt))
+            started = time.perf_counter()
+            try:
+                with span("gemini", model=breaker_name):
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(get_executor(), call),
+                        timeout=max(0.0, min(settings.GENERATION_TIMEOUT_SECONDS, deadline - loop.time())),
+                    )
+            except Exception as e:
+                record_upstream("gemini", model_name, time.perf_counter() - started, e)
+                if is_rate_limit_error(e):
+                    limiter.penalize()
+                raise
+            record_upstream("gemini", model_name, time.perf_counter() - started)
+            return result
+
+    return await retry_policy.run(breaker_name, attempt, deadline=deadline)
+
+
+_STREAM_END = object()
+
+
+async def stream_content(model: Any, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+    """Yield text chunks from ``model.generate_content(..., stream=True)``.
+
+    Both the initial request and each chunk fetch run in the shared executor,
+    so the event loop stays free while Gemini produces tokens.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    kwargs.setdefault("request_options", {"timeout": settings.GENERATION_TIMEOUT_SECONDS})
+    call = partial(model.generate_content, prompt, stream=True, **kwargs)
+    limiter = get_rate_limiter("gemini")
+    model_name = gemini_model_name(model)
+    breaker_name = gemini_breaker_name(model)
+
+    async def start() -> Any:
+        with span("rate_limit_wait", upstream="gemini"):
+            await limiter.acquire(estimate_tokens(prompt))
+        started = time.perf_counter()
+        try:
+            with span("gemini_stream_start", model=breaker_name):
+                response = await asyncio.wait_for(
+                    loop.run_in_executor(executor, call),
+                    timeout=settings.GENERATION_TIMEOUT_SECONDS,
+                )
+        except Exception as e:
+            record_upstream("gemini_stream", model_name, time.perf_counter() - started, e)
+            if is_rate_limit_error(e):
+                limiter.penalize()
+            raise
+        # Time to first response; chunk fetches are covered by the request histogram
+        record_upstream("gemini_stream", model_name, time.perf_counter() - started)
+        return response
+
+    async with get_breaker(breaker_name).guard():
+        # Only opening the stream is retried; a failure after chunks were sent is final
+        response = await retry_policy.run(breaker_name, start)
+        iterator = iter(response)
+        while True:
+            chunk = await asyncio.wait_for(
+                loop.run_in_executor(executor, next, iterator, _STREAM_END),
+                timeout=settings.GENERATION_TIMEOUT_SECONDS,
+            )
+            if chunk is _STREAM_END:
+                break
+            text = getattr(chunk, "text", None)
+            if text:
+                yield text
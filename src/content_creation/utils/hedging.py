@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Keeps a rolling window of successful call latencies per upstream."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._failures: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            self._failures[key] += 1
+
+    def percentile(self, key: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """Return the ``q`` quantile (0-1) of recent latencies, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        keys = set(self._samples) | set(self._failures)
+        return {
+            key: {
+                "samples": len(self._samples.get(key, ())),
+                "failures": self._failures.get(key, 0),
+                "p50": self.percentile(key, 0.5),
+                "p95": self.percentile(key, 0.95),
+                "p99": self.percentile(key, 0.99),
+            }
+            for key in sorted(keys)
+        }
+
+
+async def hedged_race(
+    attempts: List[Callable[[], Awaitable[T]]],
+    hedge_delay: Callable[[int], Optional[float]],
+    discard: Optional[Callable[[T], Any]] = None,
+) -> Tuple[int, T]:
+    """Run ``attempts`` in order and return ``(index, result)`` of the first success.
+
+    The next attempt starts as soon as the running ones have all failed, or
+    once ``hedge_delay(i)`` seconds have passed since attempt ``i`` started
+    (None waits for failure only; 0 races immediately). Attempts still
+    running when a winner is found are cancelled; ``discard`` is called with
+    the result of any other attempt that succeeded anyway. If every attempt
+    fails, the last error is raised.
+    """
+    if not attempts:
+        raise ValueError("No attempts to run")
+
+    pending: Dict[asyncio.Task, int] = {}
+    launched = 0
+    launched_at = 0.0
+    last_error: Optional[BaseException] = None
+
+    def launch() -> None:
+        nonlocal launched, launched_at
+        task = asyncio.ensure_future(attempts[launched]())
+        pending[task] = launched
+        launched += 1
+        launched_at = time.monotonic()
+
+    launch()
+    try:
+        while pending:
+            timeout = None
+            if launched < len(attempts):
+                delay = hedge_delay(launched - 1)
+                if delay is not None:
+                    timeout = max(0.0, launched_at + delay - time.monotonic())
+
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info(f"Hedging: starting attempt {launched} after {timeout:.2f}s")
+                launch()
+                continue
+
+            winner = None
+            # Attempts that finished together are settled in launch order
+            for task in sorted(done, key=pending.get):
+                index = pending.pop(task)
+                if task.exception() is not None:
+                    last_error = task.exception()
+                elif winner is None:
+                    winner = index, task.result()
+                elif discard is not None:
+                    discard(task.result())
+            if winner is not None:
+                return winner
+
+            if launched < len(attempts):
+                launch()
+    finally:
+        for task in pending:
+            if not task.done():
+                task.cancel()
+            elif discard is not None and not task.cancelled() and task.exception() is None:
+                discard(task.result())
+
+    raise last_error
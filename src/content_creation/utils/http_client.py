@@ -0,0 +1,29 @@
+import logging
+import httpx
+from fastapi import Request
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the app-lifetime pooled HTTP client used for upstream image calls."""
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_READ_TIMEOUT_SECONDS,
+        connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+    )
+    logger.info(
+        f"HTTP client created (max_connections={settings.HTTP_MAX_CONNECTIONS}, "
+        f"keepalive={settings.HTTP_MAX_KEEPALIVE_CONNECTIONS})"
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """FastAPI dependency returning the client created in the app lifespan."""
+    return request.app.state.clients.http_client
@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_hit_at REAL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def make_image_key(enhanced_prompt: str, negative_prompt: str, width: int, height: int, style_preset: str, cfg_scale: float, steps: int) -> str:
+    """Build a content-addressed key from everything that determines the image."""
+    material = json.dumps(
+        {
+            "prompt": enhanced_prompt,
+            "negative_prompt": negative_prompt,
+            "width": width,
+            "height": height,
+            "style_preset": style_preset,
+            "cfg_scale": cfg_scale,
+            "steps": steps,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """Persistent index of generated images keyed by generation parameters.
+
+    The index lives in SQLite (WAL mode) so it survives restarts and can be
+    shared safely by several uvicorn worker processes. Each operation opens
+    its own short-lived connection and runs in a worker thread.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10.0)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT url, path FROM images WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            url, path = row
+            if not Path(path).exists():
+                # The file was removed out from under the index
+                conn.execute("DELETE FROM images WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE images SET hits = hits + 1, last_hit_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            return url
+
+    def _store(self, key: str, url: str, path: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO images (key, url, path, created_at) VALUES (?, ?, ?, ?)",
+                (key, url, path, time.time()),
+            )
+
+    async def lookup(self, key: str) -> Optional[str]:
+        """Return the URL of a previously generated image, or None."""
+        try:
+            return await asyncio.to_thread(self._lookup, key)
+        except sqlite3.Error as e:
+            logger.warning(f"Image cache lookup failed: {str(e)}")
+            return None
+
+    async def store(self, key: str, url: str, path: Path) -> None:
+        """Record a freshly generated image in the index."""
+        try:
+            await asyncio.to_thread(self._store, key, url, str(path))
+        except sqlite3.Error as e:
+            logger.warning(f"Image cache store failed: {str(e)}")
+
+
+_image_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> Optional[ImageCache]:
+    """Return the shared image cache, or None when disabled."""
+    global _image_cache
+    if not settings.IMAGE_CACHE_ENABLED:
+        return None
+    if _image_cache is None:
+        _image_cache = ImageCache(settings.IMAGE_CACHE_DB)
+    return _image_cache
@@ -0,0 +1,140 @@
+import logging
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+from .image_render import render_derivatives
+from .image_store import get_image_store
+from .metrics import generated_image_bytes
+from .render_pool import run_render
+from .single_flight import SingleFlight
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Crops per platform as (variant, width, height), following each platform's
+# recommended feed/story sizes
+PLATFORM_VARIANTS: Dict[str, List[Tuple[str, int, int]]] = {
+    "instagram": [("square", 1080, 1080), ("portrait", 1080, 1350), ("story", 1080, 1920)],
+    "facebook": [("feed", 1200, 630)],
+    "twitter": [("post", 1600, 900)],
+    "linkedin": [("post", 1200, 627)],
+    "tiktok": [("cover", 1080, 1920)],
+}
+
+# Concurrent requests for the same master share one render; renders beyond
+# IMAGE_DERIVATIVE_MAX_PENDING_RENDERS are skipped
+_renders = SingleFlight()
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@lru_cache(maxsize=None)
+def derivative_formats() -> Tuple[str, ...]:
+    """Return the configured derivative formats this Pillow build can write."""
+    from PIL import Image
+
+    Image.init()
+    formats = []
+    for image_format in settings.IMAGE_DERIVATIVE_FORMATS:
+        image_format = image_format.lower()
+        if image_format.upper() in Image.SAVE:
+            formats.append(image_format)
+        else:
+            logger.warning(f"Pillow can't write {image_format}; skipping that derivative format")
+    return tuple(formats)
+
+
+def png_size(path: Path) -> Optional[Tuple[int, int]]:
+    """Read a PNG's width and height from its header, or None if it isn't a PNG."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if len(header) < 24 or not header.startswith(PNG_SIGNATURE):
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def cap_size(width: int, height: int, max_width: int, max_height: int) -> Tuple[int, int]:
+    """Scale ``width`` x ``height`` down, keeping its aspect ratio, to fit within the maximum."""
+    scale = min(1.0, max_width / width, max_height / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def plan_derivatives(master_path: Path, platform: str) -> List[Dict[str, Any]]:
+    """List the derivatives of ``master_path`` for ``platform`` and where each one lives.
+
+    Crops are never larger than the master; a 512px master gets a 288x512
+    story rather than an upscaled 1080x1920 one.
+    """
+    platform = platform.lower()
+    sizes = [(f"{platform}_{variant}", variant, width, height) for variant, width, height in PLATFORM_VARIANTS.get(platform, [])]
+    sizes.append(("thumb", "thumbnail", settings.IMAGE_THUMBNAIL_SIZE, settings.IMAGE_THUMBNAIL_SIZE))
+
+    master_size = png_size(master_path)
+    plan = []
+    for suffix, variant, width, height in sizes:
+        if master_size:
+            width, height = cap_size(width, height, *master_size)
+        for image_format in derivative_formats():
+            plan.append({
+                "variant": variant,
+                "format": image_format,
+                "width": width,
+                "height": height,
+                "path": master_path.with_name(f"{master_path.stem}_{suffix}.{image_format}"),
+            })
+    return plan
+
+
+async def _render_missing(master_path: Path, missing: List[Dict[str, Any]]) -> None:
+    image_store = get_image_store()
+    tmp_paths = [image_store.temp_path() for _ in missing]
+    outputs = [(item["width"], item["height"], item["format"], str(tmp)) for item, tmp in zip(missing, tmp_paths)]
+    try:
+        with span("image_derivatives", count=len(missing)):
+            sizes = await run_render(render_derivatives, str(master_path), outputs)
+        for item, tmp_path, size in zip(missing, tmp_paths, sizes):
+            await image_store.adopt(tmp_path, item["path"].name, beside=master_path)
+            generated_image_bytes.labels("derivative").inc(size)
+    finally:
+        for tmp_path in tmp_paths:
+            tmp_path.unlink(missing_ok=True)
+
+
+async def create_image_variants(image_url: str, platform: str) -> List[Dict[str, Any]]:
+    """Return per-platform crops and a thumbnail of a stored image, rendering any that are missing.
+
+    Derivatives are written next to the master, so a later request for the
+    same image and platform reuses them instead of rendering again. If
+    ``IMAGE_DERIVATIVE_MAX_PENDING_RENDERS`` other masters are already being
+    rendered, only the derivatives that exist are returned.
+    """
+    image_store = get_image_store()
+    master_path = image_store.path_for_url(image_url)
+    plan = plan_derivatives(master_path, platform)
+
+    missing = [item for item in plan if not item["path"].exists()]
+    if missing:
+        key = f"{master_path}:{platform.lower()}"
+        if key not in _renders.waiters() and len(_renders.waiters()) >= settings.IMAGE_DERIVATIVE_MAX_PENDING_RENDERS:
+            logger.warning("Too many derivative renders pending; skipping variants that aren't rendered yet")
+            plan = [item for item in plan if item not in missing]
+            missing = []
+        else:
+            await _renders.do(key, lambda: _render_missing(master_path, missing))
+    for item in plan:
+        if item not in missing:
+            await image_store.touch(item["path"])
+
+    return [
+        {
+            "variant": item["variant"],
+            "format": item["format"],
+            "width": item["width"],
+            "height": item["height"],
+            "url": image_store.url_for(item["path"]),
+        }
+        for item in plan
+    ]
@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import sqlite3
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    image_prompt TEXT NOT NULL,
+    image_url TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS image_jobs_finished_at ON image_jobs (finished_at);
+"""
+
+
+class ImageJob:
+    """State of one background image generation."""
+
+    def __init__(self, prompt: str, work: Callable[[], Awaitable[Optional[str]]]):
+        self.id = uuid.uuid4().hex
+        self.prompt = prompt
+        self.work = work
+        self.status = PENDING
+        self.image_url: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+        # Saves run in threads; one at a time, so an older state never lands last
+        self.save_lock = asyncio.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "image_prompt": self.prompt,
+            "image_url": self.image_url,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ImageJobStore:
+    """Job states in SQLite (WAL mode), so any uvicorn worker can answer a poll.
+
+    Each operation opens its own short-lived connection and runs in a worker
+    thread. Finished jobs are deleted once there are more than
+    ``max_finished`` of them or they are older than ``finished_ttl``.
+    """
+
+    def __init__(self, db_path: str, max_finished: int, finished_ttl: float):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_finished = max_finished
+        self.finished_ttl = finished_ttl
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10.0)
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO image_jobs (id, status, image_prompt, image_url, error, created_at, finished_at) "
+                "VALUES (:id, :status, :image_prompt, :image_url, :error, :created_at, :finished_at)",
+                state,
+            )
+            if state["finished_at"] is not None:
+                conn.execute("DELETE FROM image_jobs WHERE finished_at < ?", (time.time() - self.finished_ttl,))
+                conn.execute(
+                    "DELETE FROM image_jobs WHERE id IN (SELECT id FROM image_jobs WHERE finished_at IS NOT NULL "
+                    "ORDER BY finished_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_finished,),
+                )
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM image_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or (row["finished_at"] is not None and row["finished_at"] < time.time() - self.finished_ttl):
+            return None
+        return dict(row)
+
+    async def save(self, job: ImageJob) -> None:
+        """Record the job's current state."""
+        try:
+            await asyncio.to_thread(self._save, job.to_dict())
+        except sqlite3.Error as e:
+            logger.warning(f"Saving image job {job.id} failed: {str(e)}")
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the saved state of a job, or None."""
+        try:
+            return await asyncio.to_thread(self._load, job_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Loading image job {job_id} failed: {str(e)}")
+            return None
+
+
+class ImageJobManager:
+    """Runs image generations on a pool of background workers.
+
+    A job runs in the process that accepted it and is kept in its memory;
+    finished jobs are evicted once there are more than ``max_finished`` of
+    them or they are older than ``finished_ttl``. With a ``db_path``, every
+    state change is also saved to an ``ImageJobStore``, so a poll that lands
+    on another uvicorn worker still finds the job.
+    """
+
+    def __init__(
+        self,
+        worker_count: int,
+        queue_size: int,
+        max_finished: int,
+        finished_ttl: float,
+        db_path: Optional[str] = None,
+        poll_interval: float = 0.5,
+    ):
+        self.worker_count = worker_count
+        self.queue_size = queue_size
+        self.max_finished = max_finished
+        self.finished_ttl = finished_ttl
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.store: Optional[ImageJobStore] = None
+        self._jobs: Dict[str, ImageJob] = {}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        if self.db_path is not None and self.store is None:
+            self.store = await asyncio.to_thread(ImageJobStore, self.db_path, self.max_finished, self.finished_ttl)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"image-job-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"Image job manager started with {self.worker_count} workers")
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def submit(self, prompt: str, work: Callable[[], Awaitable[Optional[str]]]) -> ImageJob:
+        """Queue ``work`` and return its job. Raises ``asyncio.QueueFull`` when saturated."""
+        if self._queue is None:
+            raise RuntimeError("Image job manager is not running")
+        self._evict()
+        job = ImageJob(prompt, work)
+        self._queue.put_nowait(job)
+        self._jobs[job.id] = job
+        # Saved before the job id is returned, so the first poll finds it anywhere
+        await self._save(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the state of a job accepted by any worker process, or None."""
+        self._evict()
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is None:
+            return None
+        return await self.store.load(job_id)
+
+    async def wait(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Wait until a job finishes and return its final state, or None if it is gone.
+
+        Jobs of this process are awaited directly; jobs of another worker
+        process are polled from the store every ``poll_interval`` seconds.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            await job.done.wait()
+            return job.to_dict()
+        while True:
+            state = await self.store.load(job_id) if self.store is not None else None
+            if state is None or state["status"] in FINISHED_STATUSES:
+                return state
+            await asyncio.sleep(self.poll_interval)
+
+    async def _save(self, job: ImageJob) -> None:
+        if self.store is not None:
+            async with job.save_lock:
+                await self.store.save(job)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            await self._save(job)
+            try:
+                job.image_url = await job.work()
+                if job.image_url:
+                    job.status = SUCCEEDED
+                else:
+                    job.status = FAILED
+                    job.error = "Image generation returned no image"
+            except asyncio.CancelledError:
+                job.status = FAILED
+                job.error = "Image generation was cancelled"
+                raise
+            except Exception as e:
+                logger.error(f"Image job {job.id} failed: {str(e)}")
+                job.status = FAILED
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+                job.work = None
+                self._finished[job.id] = job.finished_at
+                job.done.set()
+                self._queue.task_done()
+            await self._save(job)
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.finished_ttl
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_finished and finished_at >= cutoff:
+                break
+            self._finished.popitem(last=False)
+            self._jobs.pop(job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": len(self._jobs),
+            "finished": len(self._finished),
+        }
+
+
+# Shared job manager, started and stopped in the app lifespan
+image_jobs = ImageJobManager(
+    worker_count=settings.IMAGE_JOB_WORKERS,
+    queue_size=settings.IMAGE_JOB_QUEUE_SIZE,
+    max_finished=settings.IMAGE_JOB_MAX_FINISHED,
+    finished_ttl=settings.IMAGE_JOB_TTL_SECONDS,
+    db_path=settings.IMAGE_CACHE_DB,
+    poll_interval=settings.IMAGE_JOB_POLL_INTERVAL_SECONDS,
+)
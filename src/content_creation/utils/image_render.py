@@ -0,0 +1,104 @@
+import io
+import os
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+# Functions here run inside the render pool. They are module-level, take only
+# picklable arguments and the module imports nothing from the app, so spawned
+# render processes start quickly. Pillow is imported inside each function, so
+# the API process can import this module without loading it.
+
+SAVE_OPTIONS = {
+    "webp": {"quality": 85, "method": 4},
+    "avif": {"quality": 60},
+    "jpeg": {"quality": 85, "optimize": True, "progressive": True},
+    "png": {"optimize": True},
+}
+
+
+def render_derivatives(master_path: str, outputs: List[Tuple[int, int, str, str]]) -> List[int]:
+    """Crop and resize ``master_path`` once per ``(width, height, format, out_path)``.
+
+    Each output is center-cropped to its aspect ratio and scaled to fit.
+    Returns the size in bytes of each file written.
+    """
+    from PIL import Image, ImageOps
+
+    sizes = []
+    with Image.open(master_path) as master:
+        master.load()
+        for width, height, image_format, out_path in outputs:
+            image = ImageOps.fit(master, (width, height), method=Image.Resampling.LANCZOS)
+            if image_format == "jpeg" and image.mode != "RGB":
+                image = image.convert("RGB")
+            image.save(out_path, format=image_format.upper(), **SAVE_OPTIONS.get(image_format, {}))
+            sizes.append(os.path.getsize(out_path))
+    return sizes
+
+
+PLACEHOLDER_SIZE = (800, 600)
+PLACEHOLDER_FONTS = ["Arial.ttf", "Verdana.ttf", "Tahoma.ttf", "calibri.ttf"]
+
+
+@lru_cache(maxsize=1)
+def _placeholder_font() -> Any:
+    from PIL import ImageFont
+
+    # Probing candidates touches the filesystem, so do it once per process
+    for font_name in PLACEHOLDER_FONTS:
+        try:
+            return ImageFont.truetype(font_name, 36)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1)
+def _placeholder_base() -> Any:
+    """Draw the parts of the placeholder that don't depend on the prompt."""
+    from PIL import Image, ImageDraw
+
+    width, height = PLACEHOLDER_SIZE
+    image = Image.new("RGB", (width, height), (200, 200, 240))  # Light blue-gray
+    draw = ImageDraw.Draw(image)
+
+    # Border, inner frame and a circle for visual interest
+    draw.rectangle([(0, 0), (width - 1, height - 1)], outline=(100, 100, 180), width=10)
+    draw.rectangle([(50, 50), (width - 50, height - 50)], outline=(150, 150, 210), width=5)
+    draw.ellipse([(width // 4, height // 4), (3 * width // 4, 3 * height // 4)], outline=(100, 100, 180), width=5)
+
+    draw.text((width // 2 - 100, 100), "Test Image", fill=(50, 50, 100), font=_placeholder_font())
+    return image
+
+
+def _png_bytes(image: Any) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_placeholder(prompt: str) -> bytes:
+    """Return the placeholder image for ``prompt`` as PNG bytes.
+
+    The font and the prompt-independent canvas are built once per process;
+    each call only copies the canvas and draws the prompt line.
+    """
+    from PIL import ImageDraw
+
+    width, height = PLACEHOLDER_SIZE
+    image = _placeholder_base().copy()
+    draw = ImageDraw.Draw(image)
+    draw.text((width // 2 - 200, height // 2), f"Prompt: {prompt[:50]}...", fill=(50, 50, 100), font=_placeholder_font())
+    return _png_bytes(image)
+
+
+def render_simple_placeholder() -> bytes:
+    """Return a plain red rectangle, used if the regular placeholder can't be drawn."""
+    from PIL import Image
+
+    return _png_bytes(Image.new("RGB", (400, 300), (255, 0, 0)))
+
+
+def warm_placeholder_renderer() -> None:
+    """Load the placeholder font and canvas in this render process."""
+    _placeholder_base()
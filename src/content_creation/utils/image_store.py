@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiofiles
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_last_access ON files (last_access);
+CREATE TABLE IF NOT EXISTS store_usage (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL,
+    files INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_usage (id, bytes, files) VALUES (0, 0, 0);
+"""
+
+EVICT_BATCH = 500
+EVICT_LOW_WATER = 0.9  # Evict down to this fraction of the byte budget
+AGE_SWEEP_INTERVAL_SECONDS = 300.0
+
+
+class ImageStore:
+    """Bounded store for generated images.
+
+    Files live in two levels of hashed subdirectories (``ab/cd/name``) so no
+    directory grows past a few hundred entries even at millions of images.
+    Writes go to a temporary file and are renamed into place. A SQLite index
+    (WAL mode, shared by worker processes) records each file's size and last
+    access plus a running byte total, so the size and age limits are enforced
+    by evicting least recently used files without scanning directories.
+    """
+
+    def __init__(self, root: str, url_prefix: str, db_path: str, max_bytes: int, max_age_seconds: float):
+        self.root = Path(root)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.tmp_dir = self.root / ".tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._evict_lock = threading.Lock()
+        self._last_age_sweep = 0.0
+        self.evicted = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10.0)
+
+    def path_for(self, name: str) -> Path:
+        digest = hashlib.sha256(name.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / digest[2:4] / name
+
+    def url_for(self, path: Path) -> str:
+        return f"{self.url_prefix}/{path.relative_to(self.root).as_posix()}"
+
+    def path_for_url(self, url: str) -> Path:
+        return self.root / url[len(self.url_prefix) + 1:]
+
+    def temp_path(self) -> Path:
+        """Return a fresh path in the store's temp directory (same filesystem, so renames are atomic)."""
+        return self.tmp_dir / f"{uuid.uuid4().hex}.{os.getpid()}.tmp"
+
+    def _index(self, path: Path, size: int) -> int:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT size FROM files WHERE path = ?", (str(path),)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (str(path), size, now, now),
+            )
+            if row is None:
+                conn.execute("UPDATE store_usage SET bytes = bytes + ?, files = files + 1 WHERE id = 0", (size,))
+            else:
+                conn.execute("UPDATE store_usage SET bytes = bytes + ? WHERE id = 0", (size - row[0],))
+            return conn.execute("SELECT bytes FROM store_usage WHERE id = 0").fetchone()[0]
+
+    def _evict(self, total_bytes: int) -> None:
+        """Drop files past the age limit, then least recently used files until under budget."""
+        if not self._evict_lock.acquire(blocking=False):
+            return  # Another thread in this process is already evicting
+        try:
+            now = time.time()
+            if self.max_age_seconds > 0 and now - self._last_age_sweep >= AGE_SWEEP_INTERVAL_SECONDS:
+                self._last_age_sweep = now
+                cutoff = now - self.max_age_seconds
+                while self._evict_batch("SELECT path, size FROM files WHERE last_access < ? ORDER BY last_access LIMIT ?", (cutoff, EVICT_BATCH)):
+                    pass
+            if self.max_bytes > 0 and total_bytes > self.max_bytes:
+                target = self.max_bytes * EVICT_LOW_WATER
+                while (excess := self._usage()["bytes"] - target) > 0:
+                    if not self._evict_batch("SELECT path, size FROM files ORDER BY last_access LIMIT ?", (EVICT_BATCH,), excess):
+                        break
+        finally:
+            self._evict_lock.release()
+
+    def _evict_batch(self, query: str, params: tuple, limit_bytes: Optional[float] = None) -> int:
+        """Delete the selected rows and their files, stopping once ``limit_bytes`` are freed."""
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+            removed = 0
+            freed = 0
+            for path, size in rows:
+                if limit_bytes is not None and freed >= limit_bytes:
+                    break
+                # Another worker may have evicted the same row already
+                if conn.execute("DELETE FROM files WHERE path = ?", (path,)).rowcount:
+                    Path(path).unlink(missing_ok=True)
+                    removed += 1
+                    freed += size
+            conn.execute("UPDATE store_usage SET bytes = bytes - ?, files = files - ? WHERE id = 0", (freed, removed))
+        self.evicted += removed
+        if removed:
+            logger.info(f"Evicted {removed} images ({freed} bytes) from the image store")
+        return len(rows)
+
+    def _usage(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            total_bytes, files = conn.execute("SELECT bytes, files FROM store_usage WHERE id = 0").fetchone()
+        return {"bytes": total_bytes, "files": files}
+
+    def _commit(self, path: Path, size: int) -> None:
+        self._evict(self._index(path, size))
+
+    async def _finish(self, path: Path, size: int) -> None:
+        try:
+            await asyncio.to_thread(self._commit, path, size)
+        except sqlite3.Error as e:
+            logger.warning(f"Image store index update failed: {str(e)}")
+
+    async def adopt(self, tmp_path: Path, name: str, beside: Optional[Path] = None) -> Path:
+        """Atomically move a fully written temporary file into the store as ``name``.
+
+        With ``beside``, the file goes in the same directory as that stored
+        file instead of its own hashed directory.
+        """
+        path = beside.with_name(name) if beside is not None else self.path_for(name)
+        size = tmp_path.stat().st_size
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+        await self._finish(path, size)
+        return path
+
+    async def write_bytes(self, name: str, data: bytes) -> Path:
+        """Write ``data`` into the store as ``name`` without blocking the event loop."""
+        tmp_path = self.temp_path()
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                await f.write(data)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return await self.adopt(tmp_path, name)
+
+    async def touch(self, path: Path) -> None:
+        """Mark a stored file as recently used so LRU eviction keeps it."""
+        def update() -> None:
+            with self._connect() as conn:
+                conn.execute("UPDATE files SET last_access = ? WHERE path = ?", (time.time(), str(path)))
+
+        try:
+            await asyncio.to_thread(update)
+        except sqlite3.Error as e:
+            logger.warning(f"Image store touch failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._usage(),
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+            "evicted": self.evicted,
+        }
+
+
+_image_store: Optional[ImageStore] = None
+
+
+def get_image_store() -> ImageStore:
+    """Return the shared image store configured from Settings."""
+    global _image_store
+    if _image_store is None:
+        _image_store = ImageStore(
+            root=settings.IMAGE_STORE_DIR,
+            url_prefix=settings.IMAGE_STORE_URL_PREFIX,
+            db_path=settings.IMAGE_CACHE_DB,
+            max_bytes=settings.IMAGE_STORE_MAX_BYTES,
+            max_age_seconds=settings.IMAGE_STORE_MAX_AGE_SECONDS,
+        )
+    return _image_store
@@ -0,0 +1,110 @@
+import base64
+import logging
+import re
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import aiofiles
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_VALUE_START = re.compile(rb'\s*:\s*"')
+_VALUE_PREFIX = re.compile(rb'\s*(:\s*)?$')
+
+
+class Base64ArtifactDecoder:
+    """Incrementally extracts and decodes the first ``"base64"`` string of a JSON body.
+
+    Feed the body in chunks of any size; each call returns the image bytes
+    decoded so far. Only the current chunk plus a few carried-over bytes are
+    held at a time, so memory does not grow with the image size. This is not
+    a general JSON parser: it relies on base64 text never containing quotes.
+    """
+
+    KEY = b'"base64"'
+
+    def __init__(self):
+        self._state = "key"
+        self._buffer = b""
+        self._pending = b""  # Base64 characters not yet forming a full 4-char group
+        self.done = False
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self.done:
+            return b""
+        data = self._buffer + chunk
+        self._buffer = b""
+
+        if self._state == "key":
+            index = data.find(self.KEY)
+            if index < 0:
+                # Keep enough of the tail to match a key split across chunks
+                self._buffer = data[-(len(self.KEY) - 1):]
+                return b""
+            data = data[index + len(self.KEY):]
+            self._state = "colon"
+
+        if self._state == "colon":
+            match = _VALUE_START.match(data)
+            if match is None:
+                if _VALUE_PREFIX.match(data) is None:
+                    raise ValueError("Malformed JSON after base64 key")
+                self._buffer = data
+                return b""
+            data = data[match.end():]
+            self._state = "value"
+
+        end = data.find(b'"')
+        if end >= 0:
+            data = data[:end]
+        elif data.endswith(b"\\"):
+            # Don't split an escape sequence across chunks
+            self._buffer = b"\\"
+            data = data[:-1]
+
+        # JSON may escape "/" as "\/"; base64 decoding ignores nothing else we expect here
+        encoded = self._pending + data.replace(b"\\/", b"/")
+        if end >= 0:
+            self.done = True
+            self._pending = b""
+            return base64.b64decode(encoded + b"=" * (-len(encoded) % 4))
+        usable = len(encoded) - len(encoded) % 4
+        self._pending = encoded[usable:]
+        return base64.b64decode(encoded[:usable])
+
+
+async def _write_stream(chunks: AsyncIterator[bytes], tmp_path: Path, decoder: Optional[Base64ArtifactDecoder]) -> int:
+    written = 0
+    async with aiofiles.open(tmp_path, "wb") as f:
+        async for chunk in chunks:
+            data = decoder.feed(chunk) if decoder is not None else chunk
+            if data:
+                await f.write(data)
+                written += len(data)
+    if decoder is not None and not decoder.done:
+        raise ValueError("No base64 artifact in response")
+    return written
+
+
+async def stream_image_to_file(response: httpx.Response, tmp_path: Path) -> Path:
+    """Stream an image response body into the temporary file ``tmp_path``.
+
+    JSON bodies have their first base64 artifact decoded on the fly; any
+    other content type is written as-is. Returns ``tmp_path``, which the
+    caller renames into place; it is removed if anything goes wrong,
+    including cancellation.
+    """
+    content_type = response.headers.get("Content-Type", "")
+    decoder = Base64ArtifactDecoder() if "json" in content_type else None
+    if decoder is None:
+        logger.warning(f"Response is not JSON ({content_type}), saving body as image data")
+
+    try:
+        written = await _write_stream(response.aiter_bytes(), tmp_path, decoder)
+        if written == 0:
+            raise ValueError("Empty image in response")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path
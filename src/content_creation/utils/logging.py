@@ -1,39 +1,152 @@
-import logging
+import atexit
+import copy
 import json
-from datetime import datetime
-from typing import Any
+import logging
+import logging.handlers
+import queue
+import random
+import time
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+    return _json_encoder.encode(data)
+
 
 class CustomJSONFormatter(logging.Formatter):
     def __init__(self):
         super().__init__()
-        self.default_fields = {
-            'timestamp': '',
-            'level': '',
-            'message': '',
-            'module': '',
-        }
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        # Rendering the date part once per second keeps timestamps cheap
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}"
 
     def format(self, record: logging.LogRecord) -> str:
         json_record = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': self._timestamp(record.created),
             'level': record.levelname,
             'message': record.getMessage(),
             'module': record.module,
             'line_number': record.lineno
         }
 
-        if hasattr(record, 'request_id'):
-            json_record['request_id'] = record.request_id
+        # Include every ``extra`` field, not just request_id
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and key not in json_record:
+                json_record[key] = value
 
         if record.exc_info:
             json_record['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            json_record['exception'] = record.exc_text
+
+        return _dumps(json_record)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a configurable fraction of INFO records; other levels always pass.
+
+    ``rates`` maps logger name prefixes to sample rates (0-1); the longest
+    matching prefix wins, otherwise ``default_rate`` applies.
+    """
+
+    def __init__(self, default_rate: float = 1.0, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.default_rate = default_rate
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._resolved: Dict[str, float] = {}
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = self.default_rate
+            for prefix, prefix_rate in self.rates:
+                if name == prefix or name.startswith(prefix + "."):
+                    rate = prefix_rate
+                    break
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.INFO:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves message formatting to the writer thread.
+
+    Only the traceback is rendered on the calling thread (traceback objects
+    must not outlive the frame); ``msg % args`` and JSON encoding happen in
+    the background listener. Don't log objects that are mutated right after.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DeferredQueueHandler] = None
 
-        return json.dumps(json_record)
 
 def setup_logging():
+    """Route all logging through a queue to a background JSON writer thread."""
+    global _listener, _queue_handler
     logger = logging.getLogger()
-    handler = logging.StreamHandler()
-    handler.setFormatter(CustomJSONFormatter())
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+
+    if _listener is None:
+        # Replace any handlers installed earlier (e.g. by basicConfig) so records are written once
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(CustomJSONFormatter())
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = DeferredQueueHandler(log_queue)
+        _queue_handler.addFilter(SamplingFilter(settings.LOG_INFO_SAMPLE_RATE, settings.LOG_SAMPLE_RATES))
+        logger.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+    logger.setLevel(settings.LOG_LEVEL)
     return logger
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
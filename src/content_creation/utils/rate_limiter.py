@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional
+
+from ..config.settings import settings
+from .exceptions import RateLimitExceededError
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+
+# Priority lane of the current request; batch and offline work switch this to BULK
+request_priority: ContextVar[str] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True if ``exc`` is an upstream 429 / quota error."""
+    return getattr(exc, "code", None) == 429 or type(exc).__name__ in ("ResourceExhausted", "TooManyRequests")
+
+
+class _Waiter:
+    __slots__ = ("cost", "event")
+
+    def __init__(self, cost: float):
+        self.cost = cost
+        self.event = asyncio.Event()
+
+
+class AdaptiveRateLimiter:
+    """Token-bucket limiter for requests and tokens per minute with priority lanes.
+
+    Waiters are served strictly in order, interactive before bulk, and give
+    up with RateLimitExceededError once their lane's queue deadline passes.
+    A 429 halves the effective rate (down to ``min_fraction``) and honours
+    Retry-After by pausing the limiter; the rate recovers linearly over
+    ``recovery_seconds``. A budget of 0 disables that bucket.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float = 0, burst_seconds: float = 5.0, deadlines: Optional[Dict[str, float]] = None, min_fraction: float = 0.1, recovery_seconds: float = 60.0):
+        self.name = name
+        self.requests_per_second = requests_per_minute / 60.0
+        self.tokens_per_second = tokens_per_minute / 60.0
+        self.burst_seconds = burst_seconds
+        self.deadlines = deadlines or {INTERACTIVE: 10.0, BULK: 300.0}
+        self.min_fraction = min_fraction
+        self.recovery_seconds = recovery_seconds
+        self.fraction = 1.0
+        self.paused_until = 0.0
+        self.throttled = 0
+        self.rejected = 0
+        self._requests = self._request_capacity()
+        self._tokens = self._token_capacity()
+        self._updated = time.monotonic()
+        self._queues: Dict[str, Deque[_Waiter]] = {lane: deque() for lane in PRIORITIES}
+
+    def _request_capacity(self) -> float:
+        return max(1.0, self.requests_per_second * self.burst_seconds)
+
+    def _token_capacity(self) -> float:
+        return max(1.0, self.tokens_per_second * self.burst_seconds)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed <= 0:
+            return
+        if self.fraction < 1.0 and self.recovery_seconds > 0:
+            self.fraction = min(1.0, self.fraction + elapsed / self.recovery_seconds * (1.0 - self.min_fraction))
+        self._requests = min(self._request_capacity(), self._requests + elapsed * self.requests_per_second * self.fraction)
+        self._tokens = min(self._token_capacity(), self._tokens + elapsed * self.tokens_per_second * self.fraction)
+
+    def _try_take(self, cost: float) -> float:
+        """Take capacity for one call and return 0, or return seconds until it may be available."""
+        now = time.monotonic()
+        self._refill(now)
+        waits = [self.paused_until - now]
+        if self.requests_per_second > 0 and self._requests < 1.0:
+            waits.append((1.0 - self._requests) / (self.requests_per_second * self.fraction))
+        cost = min(cost, self._token_capacity())
+        if self.tokens_per_second > 0 and self._tokens < cost:
+            waits.append((cost - self._tokens) / (self.tokens_per_second * self.fraction))
+        wait = max(waits)
+        if wait > 0:
+            return wait
+        if self.requests_per_second > 0:
+            self._requests -= 1.0
+        if self.tokens_per_second > 0:
+            self._tokens -= cost
+        return 0.0
+
+    def _head(self) -> Optional[_Waiter]:
+        for lane in PRIORITIES:
+            if self._queues[lane]:
+                return self._queues[lane][0]
+        return None
+
+    async def acquire(self, cost: float = 0, priority: Optional[str] = None) -> None:
+        """Wait for capacity for one call costing ``cost`` tokens."""
+        if self.requests_per_second <= 0 and self.tokens_per_second <= 0:
+            return
+        lane = priority or request_priority.get()
+        if lane not in self._queues:
+            lane = INTERACTIVE
+        deadline = time.monotonic() + self.deadlines.get(lane, 10.0)
+        waiter = _Waiter(cost)
+        queue = self._queues[lane]
+        queue.append(waiter)
+        try:
+            while True:
+                wait = None
+                if self._head() is waiter:
+                    wait = self._try_take(waiter.cost)
+                    if wait <= 0:
+                        return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.rejected += 1
+                    raise RateLimitExceededError(f"Rate limiter {self.name}: {lane} queue deadline exceeded")
+                waiter.event.clear()
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), timeout=min(wait, remaining) if wait is not None else remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            queue.remove(waiter)
+            head = self._head()
+            if head is not None:
+                head.event.set()
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Tighten the limiter after an upstream 429."""
+        now = time.monotonic()
+        self._refill(now)
+        self.throttled += 1
+        self.fraction = max(self.min_fraction, self.fraction * 0.5)
+        if retry_after:
+            self.paused_until = max(self.paused_until, now + retry_after)
+        logger.warning(
+            f"Rate limiter {self.name} throttled to {self.fraction:.0%} of budget"
+            + (f", paused for {retry_after:.1f}s" if retry_after else "")
+        )
+
+    def status(self) -> Dict[str, Any]:
+        self._refill(time.monotonic())
+        return {
+            "requests_per_minute": round(self.requests_per_second * 60 * self.fraction, 1),
+            "tokens_per_minute": round(self.tokens_per_second * 60 * self.fraction, 1),
+            "fraction": round(self.fraction, 3),
+            "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 1),
+            "queued": {lane: len(queue) for lane, queue in self._queues.items()},
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_rate_limiter(name: str) -> AdaptiveRateLimiter:
+    """Return the shared limiter for ``"gemini"`` or ``"stability"``."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        budgets = {
+            "gemini": (settings.GEMINI_REQUESTS_PER_MINUTE, settings.GEMINI_TOKENS_PER_MINUTE),
+            "stability": (settings.STABILITY_REQUESTS_PER_MINUTE, 0),
+        }
+        requests_per_minute, tokens_per_minute = budgets[name]
+        limiter = AdaptiveRateLimiter(
+            name,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            burst_seconds=settings.RATE_LIMIT_BURST_SECONDS,
+            deadlines={
+                INTERACTIVE: settings.RATE_LIMIT_INTERACTIVE_DEADLINE_SECONDS,
+                BULK: settings.RATE_LIMIT_BULK_DEADLINE_SECONDS,
+            },
+            min_fraction=settings.RATE_LIMIT_MIN_FRACTION,
+            recovery_seconds=settings.RATE_LIMIT_RECOVERY_SECONDS,
+        )
+        _limiters[name] = limiter
+    return limiter
+
+
+def rate_limiter_states() -> Dict[str, Dict[str, Any]]:
+    return {name: limiter.status() for name, limiter in sorted(_limiters.items())}
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from ..config.settings import settings
+from .warmup import warmup
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Shared process pool for CPU-bound image work (resizing, encoding, drawing),
+# so Pillow doesn't hold the GIL or the event loop of the API worker.
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Return the shared render pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        # Spawn rather than fork: the API process has threads and open sockets
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.RENDER_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"Render pool started with {settings.RENDER_MAX_WORKERS} processes")
+    return _pool
+
+
+async def run_render(fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn(*args)`` in the render pool. ``fn`` and its arguments must be picklable."""
+    global _pool
+    pool = get_render_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, partial(fn, *args))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool for the next call
+        logger.error("Render pool broke; it will be restarted")
+        if _pool is pool:
+            _pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+def shutdown_render_pool() -> None:
+    """Shut down the shared render pool."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _ping() -> None:
+    import PIL.Image  # noqa: F401
+
+
+async def warm_render_pool() -> None:
+    """Spawn a render process and import Pillow in it before the first request needs it."""
+    await run_render(_ping)
+
+
+warmup.register("render_pool", warm_render_pool)
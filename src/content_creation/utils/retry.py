@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import random
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class RetryBudget:
+    """Global cap on the ratio of retries to first attempts.
+
+    Every first attempt deposits ``ratio`` tokens and every retry spends one,
+    so under a broad outage retries are limited to ``ratio`` of the traffic
+    instead of multiplying it.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+# Retries left for the current request, shared by every upstream call it makes
+_request_retries: ContextVar[Optional[List[int]]] = ContextVar("request_retries", default=None)
+
+
+def reset_request_retry_budget() -> None:
+    """Give the current request a fresh per-request retry allowance."""
+    _request_retries.set([settings.RETRY_MAX_PER_REQUEST])
+
+
+def _spend_request_retry() -> bool:
+    remaining = _request_retries.get()
+    if remaining is None:
+        remaining = [settings.RETRY_MAX_PER_REQUEST]
+        _request_retries.set(remaining)
+    if remaining[0] <= 0:
+        return False
+    remaining[0] -= 1
+    return True
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True for transient upstream failures worth retrying.
+
+    ``asyncio.TimeoutError`` is not retried: it comes from ``wait_for`` around
+    executor calls, whose thread keeps running, so a retry would only pile
+    another blocked call on top of it.
+    """
+    if isinstance(exc, (httpx.TransportError, ConnectionError)):
+        return True
+    return getattr(exc, "code", None) in RETRYABLE_STATUS_CODES
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, Retry-After support and retry budgets."""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float, max_retry_after: float, budget: RetryBudget):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+        self.counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return the delay before retry number ``attempt`` (1-based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(self, upstream: str, fn: Callable[[], Awaitable[T]], deadline: Optional[float] = None) -> T:
+        """Call ``fn`` and retry transient failures according to the policy.
+
+        With ``deadline`` (an event loop time), no retry is started that
+        would begin after it.
+        """
+        counters = self.counters[upstream]
+        counters["calls"] += 1
+        self.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                if attempt >= self.max_attempts:
+                    counters["gave_up"] += 1
+                    raise
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    counters["gave_up"] += 1
+                    raise
+                delay = self.backoff(attempt, retry_after)
+                if deadline is not None and asyncio.get_running_loop().time() + delay >= deadline:
+                    counters["deadline_exceeded"] += 1
+                    raise
+                if not _spend_request_retry():
+                    counters["request_budget_exhausted"] += 1
+                    raise
+                if not self.budget.try_spend():
+                    counters["global_budget_exhausted"] += 1
+                    raise
+                counters["retries"] += 1
+                logger.warning(f"Retrying {upstream} in {delay:.2f}s after attempt {attempt} failed: {str(e)}")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "global_budget_tokens": round(self.budget.tokens, 2),
+            "upstreams": {upstream: dict(counters) for upstream, counters in sorted(self.counters.items())},
+        }
+
+
+# Shared retry policy for all upstream calls
+retry_policy = RetryPolicy(
+    max_attempts=settings.RETRY_MAX_ATTEMPTS,
+    base_delay=settings.RETRY_BASE_DELAY_SECONDS,
+    max_delay=settings.RETRY_MAX_DELAY_SECONDS,
+    max_retry_after=settings.RETRY_MAX_RETRY_AFTER_SECONDS,
+    budget=RetryBudget(ratio=settings.RETRY_BUDGET_RATIO, max_tokens=settings.RETRY_BUDGET_MAX_TOKENS),
+)
@@ -0,0 +1,100 @@
+import json
+import logging
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+from .cache import ResponseCache
+from .generation import stream_content
+
+logger = logging.getLogger(__name__)
+
+# Split fallback copy into word-sized chunks, keeping the whitespace after each word
+_CHUNK_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format a single Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an async iterator of formatted events in an SSE response."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def iter_text_chunks(text: str):
+    """Yield ``text`` in word-sized chunks so fallback copy streams like model output."""
+    for match in _CHUNK_PATTERN.finditer(text):
+        yield match.group(0)
+
+
+async def stream_generation(
+    model: Any,
+    prompt: str,
+    fallback: Optional[Callable[[], str]] = None,
+    cache: Optional[ResponseCache] = None,
+    cache_endpoint: Optional[str] = None,
+    cache_key: Optional[str] = None,
+    summary: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[str]:
+    """Stream a Gemini generation as ``chunk`` events followed by a ``summary`` event.
+
+    Cached responses and fallback copy go through the same protocol. If Gemini
+    fails before producing any text, the fallback is streamed instead; if it
+    fails part-way, the summary is marked as truncated.
+    """
+    start = time.perf_counter()
+    parts = []
+    source = "gemini"
+    truncated = False
+
+    cached = None
+    if cache is not None and cache_key is not None:
+        cached = await cache.get(cache_endpoint, cache_key)
+
+    if cached is not None:
+        source = "cache"
+        parts.append(cached)
+        yield format_sse("chunk", {"text": cached})
+    else:
+        try:
+            async for text in stream_content(model, prompt):
+                parts.append(text)
+                yield format_sse("chunk", {"text": text})
+        except Exception as e:
+            logger.error(f"Error streaming from Gemini API: {str(e)}")
+            if parts:
+                truncated = True
+            elif fallback is not None:
+                source = "fallback"
+            else:
+                yield format_sse("error", {"detail": "Generation failed. Please try again."})
+                return
+
+        if source == "gemini" and not parts and fallback is not None:
+            logger.warning("No text in Gemini API stream. Using fallback.")
+            source = "fallback"
+
+        if source == "fallback":
+            for text in iter_text_chunks(fallback()):
+                parts.append(text)
+                yield format_sse("chunk", {"text": text})
+        elif source == "gemini" and not truncated and cache is not None and cache_key is not None:
+            await cache.set(cache_endpoint, cache_key, "".join(parts).strip())
+
+    payload = dict(summary or {})
+    payload.update({
+        "text": "".join(parts).strip(),
+        "source": source,
+        "chunks": len(parts),
+        "truncated": truncated,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    })
+    yield format_sse("summary", payload)
@@ -0,0 +1,244 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start", "start_ns", "end", "attributes")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start = time.perf_counter()
+        self.start_ns = time.time_ns()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+class Trace:
+    """Spans recorded for one sampled request, keyed by its request ID."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        try:
+            self.trace_id = uuid.UUID(request_id).hex
+        except ValueError:
+            self.trace_id = uuid.uuid5(uuid.NAMESPACE_OID, request_id).hex
+        self.spans: List[Span] = []
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def should_sample(header_value: Optional[str]) -> bool:
+    """Decide whether to trace a request; the trace header overrides the sample rate."""
+    if not settings.TRACE_ENABLED:
+        return False
+    if header_value is not None:
+        value = header_value.strip().lower()
+        if value in _TRUE_VALUES:
+            return True
+        if value in _FALSE_VALUES:
+            return False
+    rate = settings.TRACE_SAMPLE_RATE
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+def start_trace(request_id: str) -> Trace:
+    """Start recording spans for the current request context."""
+    trace = Trace(request_id)
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def end_trace(trace: Trace) -> None:
+    """Stop recording for the current context and queue the trace for export."""
+    _current_trace.set(None)
+    _current_span.set(None)
+    exporter = get_trace_exporter()
+    if exporter is not None and trace.spans:
+        exporter.export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span; a no-op when the request isn't sampled.
+
+    Works in sync and async code alike. Tasks created inside the block inherit
+    it as their parent through the context.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(name, parent.span_id if parent is not None else None, attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+_TOKEN_INVALID = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+def server_timing(trace: Trace) -> str:
+    """Render finished spans as a ``Server-Timing`` header value, one metric per span name."""
+    totals: Dict[str, List[float]] = {}
+    for item in trace.spans:
+        if item.end is None:
+            continue
+        total = totals.setdefault(item.name, [0.0, 0])
+        total[0] += item.duration_ms
+        total[1] += 1
+    metrics = []
+    for name, (duration, count) in totals.items():
+        metric = f"{_TOKEN_INVALID.sub('_', name)};dur={duration:.1f}"
+        if count > 1:
+            metric += f';desc="{count} calls"'
+        metrics.append(metric)
+    return ", ".join(metrics)
+
+
+def _jsonl_record(trace: Trace) -> Dict[str, Any]:
+    root = trace.spans[0] if trace.spans else None
+    return {
+        "trace_id": trace.trace_id,
+        "request_id": trace.request_id,
+        "start_time_unix_nano": root.start_ns if root else None,
+        "spans": [
+            {
+                "span_id": item.span_id,
+                "parent_id": item.parent_id,
+                "name": item.name,
+                "start_offset_ms": round((item.start - root.start) * 1000, 3),
+                "duration_ms": round(item.duration_ms, 3),
+                "attributes": item.attributes,
+            }
+            for item in trace.spans
+        ],
+    }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_record(trace: Trace) -> Dict[str, Any]:
+    """Render a trace as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    spans = []
+    for item in trace.spans:
+        attributes = {"request_id": trace.request_id, **item.attributes}
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": item.span_id,
+            "parentSpanId": item.parent_id or "",
+            "name": item.name,
+            "kind": 2 if item.parent_id is None else 1,  # SERVER for the root, INTERNAL otherwise
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.start_ns + int(item.duration_ms * 1_000_000)),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+            "status": {"code": 2} if "error" in item.attributes else {},
+        })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": settings.PROJECT_NAME}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+        }]
+    }
+
+
+class TraceExporter:
+    """Appends finished traces to a local file from a background thread.
+
+    ``fmt`` is ``"jsonl"`` (one compact trace per line) or ``"otlp"`` (one
+    OTLP/JSON export request per line, loadable by OpenTelemetry tooling).
+    """
+
+    def __init__(self, path: str, fmt: str = "jsonl"):
+        self.path = Path(path)
+        self.render = _otlp_record if fmt == "otlp" else _jsonl_record
+        self._queue: "queue.SimpleQueue[Optional[Trace]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        self._queue.put(trace)
+
+    def _run(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                trace = self._queue.get()
+                if trace is None:
+                    break
+                try:
+                    f.write(json.dumps(self.render(trace), default=str) + "\n")
+                    if self._queue.empty():
+                        f.flush()
+                except Exception as e:
+                    logger.warning(f"Failed to export trace {trace.request_id}: {str(e)}")
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+_exporter: Optional[TraceExporter] = None
+
+
+def get_trace_exporter() -> Optional[TraceExporter]:
+    """Return the process-wide trace exporter, or None when export is disabled."""
+    global _exporter
+    if _exporter is None and settings.TRACE_EXPORT_PATH:
+        _exporter = TraceExporter(settings.TRACE_EXPORT_PATH, settings.TRACE_EXPORT_FORMAT)
+        atexit.register(shutdown_tracing)
+    return _exporter
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the trace exporter."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+        _exporter = None
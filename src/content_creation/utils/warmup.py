@@ -0,0 +1,113 @@
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+from .rate_limiter import BULK, request_priority
+
+logger = logging.getLogger(__name__)
+
+
+class WarmUp:
+    """Opt-in warm-up that runs in the background after startup.
+
+    Modules register named hooks (sync hooks run in a thread) and per-endpoint
+    replay handlers. ``start`` runs every hook concurrently, then replays
+    ``WARMUP_REQUESTS_FILE`` into the response cache; ``ready`` only becomes
+    True once that has finished, failed or timed out, so the readiness probe
+    keeps traffic away from a cold worker. Failed steps are logged, not fatal.
+    """
+
+    def __init__(self):
+        self._hooks: List[Tuple[str, Callable[[], Any]]] = []
+        self._replays: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, hook: Callable[[], Any]) -> None:
+        self._hooks.append((name, hook))
+
+    def register_replay(self, endpoint: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]]) -> None:
+        self._replays[endpoint] = handler
+
+    async def _step(self, name: str, fn: Callable[[], Any]) -> None:
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                await fn()
+            else:
+                await asyncio.to_thread(fn)
+            self.steps[name] = {"status": "ok"}
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {str(e)}")
+            self.steps[name] = {"status": "failed", "error": str(e)}
+        self.steps[name]["seconds"] = round(time.perf_counter() - started, 3)
+
+    def _load_replays(self, path: str) -> List[Tuple[str, Dict[str, Any]]]:
+        entries = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries.append((entry["endpoint"], entry["payload"]))
+        return entries
+
+    async def _replay(self) -> None:
+        entries = self._load_replays(settings.WARMUP_REQUESTS_FILE)
+        request_priority.set(BULK)
+        semaphore = asyncio.Semaphore(settings.WARMUP_REPLAY_CONCURRENCY)
+
+        async def replay_one(endpoint: str, payload: Dict[str, Any]) -> None:
+            handler = self._replays.get(endpoint)
+            if handler is None:
+                logger.warning(f"No warm-up replay handler for endpoint {endpoint}")
+                return
+            async with semaphore:
+                await handler(payload)
+
+        results = await asyncio.gather(*(replay_one(*entry) for entry in entries), return_exceptions=True)
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        logger.info(f"Replayed {len(entries) - failed}/{len(entries)} warm-up requests")
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._run_steps(), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up timed out after {settings.WARMUP_TIMEOUT_SECONDS}s; reporting ready anyway")
+        finally:
+            self.ready = True
+            logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+
+    async def _run_steps(self) -> None:
+        await asyncio.gather(*(self._step(name, hook) for name, hook in self._hooks))
+        if settings.WARMUP_REQUESTS_FILE and Path(settings.WARMUP_REQUESTS_FILE).exists():
+            await self._step("replay", self._replay)
+
+    def start(self) -> None:
+        """Begin warming up in the background, or report ready at once when disabled."""
+        if not settings.WARMUP_ENABLED:
+            self.ready = True
+            return
+        self.ready = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "enabled": settings.WARMUP_ENABLED, "steps": dict(self.steps)}
+
+
+# Shared warm-up, started in the app lifespan
+warmup = WarmUp()
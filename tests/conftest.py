@@ -0,0 +1,4 @@
+import os
+
+# Settings require an API key at import; tests never call upstream
+os.environ.setdefault("GEMINI_API_KEY", "test")
@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+
+from src.content_creation.pipeline import bulk_generation
+from src.content_creation.pipeline.bulk_generation import Checkpoint, read_records, run_bulk
+
+RECORDS = 10
+
+
+@pytest.fixture
+def input_path(tmp_path):
+    path = tmp_path / "input.jsonl"
+    path.write_text("".join(json.dumps({"n": n}) + "\n" for n in range(RECORDS)))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def fake_generate_record(monkeypatch):
+    async def generate_record(kind, record):
+        # Later records finish first, so results arrive out of order
+        await asyncio.sleep((RECORDS - record["n"]) * 0.002)
+        return {"n": record["n"]}
+
+    monkeypatch.setattr(bulk_generation, "generate_record", generate_record)
+
+
+def output_indices(path):
+    return [json.loads(line)["index"] for line in path.read_bytes().splitlines()]
+
+
+def line(index):
+    return json.dumps({"index": index, "status": "ok", "result": {"n": index}}).encode() + b"\n"
+
+
+def test_checkpoint_tracks_out_of_order_completion(tmp_path, input_path):
+    checkpoint = Checkpoint(tmp_path / "run.checkpoint", input_path, "ad")
+    for index in (2, 5, 0):
+        checkpoint.mark_done(index)
+    assert checkpoint.next_index == 1 and checkpoint.done_above == {2, 5}
+    checkpoint.mark_done(1)
+    assert checkpoint.next_index == 3 and checkpoint.done_above == {5}
+    assert [checkpoint.is_done(index) for index in range(7)] == [True, True, True, False, False, True, False]
+
+    checkpoint.save(123)
+    loaded = Checkpoint(tmp_path / "run.checkpoint", input_path, "ad")
+    assert loaded.load()
+    assert (loaded.next_index, loaded.done_above, loaded.output_offset) == (3, {5}, 123)
+
+    with pytest.raises(ValueError):
+        Checkpoint(tmp_path / "run.checkpoint", input_path, "social").load()
+
+
+@pytest.mark.asyncio
+async def test_run_writes_every_record_once(tmp_path, input_path):
+    output_path = tmp_path / "out.jsonl"
+    counts = await run_bulk(input_path, output_path, "ad", concurrency=4, checkpoint_every=1)
+
+    assert counts == {"ok": RECORDS, "failed": 0, "skipped": 0}
+    indices = output_indices(output_path)
+    assert sorted(indices) == list(range(RECORDS))
+    assert indices != sorted(indices)
+
+    checkpoint = Checkpoint(tmp_path / "out.jsonl.checkpoint", input_path, "ad")
+    checkpoint.load()
+    assert (checkpoint.next_index, checkpoint.done_above, checkpoint.output_offset) == (RECORDS, set(), output_path.stat().st_size)
+
+
+@pytest.mark.asyncio
+async def test_resume_truncates_output_written_after_checkpoint(tmp_path, input_path):
+    output_path = tmp_path / "out.jsonl"
+    checkpoint = Checkpoint(tmp_path / "out.jsonl.checkpoint", input_path, "ad")
+    # Records 5, 0 and 1 finished before the last checkpoint; 3 and a torn line after it
+    done = line(5) + line(0) + line(1)
+    output_path.write_bytes(done + line(3) + b'{"index": 7, "sta')
+    for index in (5, 0, 1):
+        checkpoint.mark_done(index)
+    checkpoint.save(len(done))
+
+    counts = await run_bulk(input_path, output_path, "ad", concurrency=3, checkpoint_every=2)
+
+    assert counts == {"ok": RECORDS - 3, "failed": 0, "skipped": 3}
+    assert output_path.read_bytes().startswith(done)
+    assert sorted(output_indices(output_path)) == list(range(RECORDS))
+
+
+@pytest.mark.asyncio
+async def test_missing_output_restarts_from_the_beginning(tmp_path, input_path):
+    output_path = tmp_path / "out.jsonl"
+    checkpoint = Checkpoint(tmp_path / "out.jsonl.checkpoint", input_path, "ad")
+    for index in range(4):
+        checkpoint.mark_done(index)
+    checkpoint.save(4096)
+
+    counts = await run_bulk(input_path, output_path, "ad", concurrency=2)
+
+    assert counts == {"ok": RECORDS, "failed": 0, "skipped": 0}
+    assert b"\0" not in output_path.read_bytes()
+    assert sorted(output_indices(output_path)) == list(range(RECORDS))
+
+
+@pytest.mark.asyncio
+async def test_offline_run_renders_chunks_and_reports_invalid_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_generation, "OFFLINE_CHUNK_SIZE", 3)
+    input_path = tmp_path / "ads.jsonl"
+    briefs = [{"brand_name": "Acme", "product_name": f"Rocket {n}", "target_audience": "coyotes", "key_features": ["fast"], "tone": "friendly"} for n in range(7)]
+    briefs[4] = {"brand_name": "Acme"}
+    input_path.write_text("".join(json.dumps(brief) + "\n" for brief in briefs))
+    output_path = tmp_path / "out.jsonl"
+
+    counts = await run_bulk(input_path, output_path, "ad", concurrency=2, offline=True)
+
+    assert counts == {"ok": 6, "failed": 1, "skipped": 0}
+    results = {result["index"]: result for result in map(json.loads, output_path.read_text().splitlines())}
+    assert sorted(results) == list(range(7))
+    assert results[4]["status"] == "error"
+    assert "Rocket 6" in results[6]["result"]["ad_copy"]
+
+
+def test_read_records_splits_csv_lists(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("brand_name,key_features,tone\nAcme,Fast; Light ;,\n")
+    assert list(read_records(path)) == [{"brand_name": "Acme", "key_features": ["Fast", "Light"]}]
@@ -0,0 +1,89 @@
+import pytest
+
+from src.content_creation.utils import generation
+from src.content_creation.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_breaker
+from src.content_creation.utils.exceptions import CircuitOpenError, RateLimitExceededError
+
+
+def make_breaker(open_seconds: float = 60.0) -> CircuitBreaker:
+    return CircuitBreaker("test", failure_rate_threshold=0.5, min_calls=4, window_seconds=60.0, open_seconds=open_seconds, half_open_probes=1)
+
+
+def test_opens_once_failure_rate_reached_over_min_calls():
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED  # Fewer than min_calls outcomes
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+
+
+def test_half_open_allows_one_probe_and_closes_on_success():
+    breaker = make_breaker(open_seconds=0.0)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()  # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_failure_reopens():
+    breaker = make_breaker(open_seconds=0.0)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_guard_records_outcomes_and_rejects_when_open():
+    breaker = make_breaker()
+    for _ in range(4):
+        with pytest.raises(ValueError):
+            async with breaker.guard():
+                raise ValueError("upstream failed")
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        async with breaker.guard():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_rejects_generation_without_touching_the_limiter(monkeypatch):
+    class Model:
+        model_name = "models/breaker-test"
+
+        def generate_content(self, prompt, **kwargs):
+            raise AssertionError("upstream must not be called")
+
+    class Limiter:
+        async def acquire(self, cost=0, priority=None):
+            raise AssertionError("an open breaker must not wait for quota")
+
+    monkeypatch.setattr(generation, "get_rate_limiter", lambda name: Limiter())
+    breaker = get_breaker(generation.gemini_breaker_name(Model()))
+    breaker._transition(OPEN)
+    try:
+        with pytest.raises(CircuitOpenError):
+            await generation.generate_content(Model(), "prompt")
+    finally:
+        breaker._transition(CLOSED)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_rejection_is_not_a_breaker_failure():
+    breaker = make_breaker()
+    for _ in range(4):
+        with pytest.raises(RateLimitExceededError):
+            async with breaker.guard():
+                raise RateLimitExceededError("queue deadline")
+    assert breaker.state == CLOSED
+    assert breaker.failure_rate() == 0.0
@@ -0,0 +1,92 @@
+import random
+import string
+from types import SimpleNamespace
+
+import pytest
+
+from src.content_creation.components.fallback_templates import (
+    AD_TEMPLATES,
+    DEFAULT_AD_TEMPLATE,
+    SOCIAL_TEMPLATES,
+    compile_template,
+    join_features,
+    parse_template,
+    render_ad,
+    render_social,
+)
+from src.content_creation.routers.social_content import SocialContentRequest, build_social_cache_key, generate_social_content
+from src.content_creation.utils.cache import get_response_cache
+from src.content_creation.utils.metrics import fallbacks
+
+ALPHABET = string.ascii_letters + string.digits + " {}%\\'\"#✨"
+
+
+def random_text(rnd: random.Random) -> str:
+    return "".join(rnd.choice(ALPHABET) for _ in range(rnd.randint(0, 20)))
+
+
+@pytest.mark.parametrize("template", [*SOCIAL_TEMPLATES.values(), *AD_TEMPLATES.values(), DEFAULT_AD_TEMPLATE])
+def test_compiled_template_matches_str_format(template):
+    render = compile_template(template)
+    fields = {field for _, field in parse_template(template) if field is not None}
+    rnd = random.Random(template)
+    for _ in range(500):
+        values = {field: random_text(rnd) for field in fields}
+        assert render(**values, unused="ignored") == template.format(**values)
+
+
+def test_render_ad_matches_formatting_the_template():
+    rnd = random.Random(0)
+    tones = [*AD_TEMPLATES, "PROFESSIONAL", "unknown"]
+    for _ in range(2000):
+        brief = (random_text(rnd), random_text(rnd), random_text(rnd), [random_text(rnd) for _ in range(rnd.randint(1, 5))], rnd.choice(tones))
+        brand_name, product_name, target_audience, key_features, tone = brief
+        template = AD_TEMPLATES.get(tone.lower(), DEFAULT_AD_TEMPLATE)
+        expected = template.format(brand_name=brand_name, product_name=product_name, target_audience=target_audience, features=join_features(key_features))
+        assert render_ad(*brief) == expected
+
+
+def social_request(**fields):
+    defaults = dict(platform="instagram", tone="engaging", product_name=None, product_category=None, key_features=None,
+                    special_features=None, target_audience=None, include_hashtags=True, include_emojis=True)
+    return SimpleNamespace(**{**defaults, **fields})
+
+
+@pytest.mark.parametrize("request_fields, expected", [
+    (
+        dict(tone="friendly", product_name="Trail Shoe", product_category="Outdoor", key_features=["Waterproof", "Light"],
+             special_features="Recycled sole", target_audience="hikers"),
+        "✨ NEW PRODUCT ALERT! ✨\n\n😊 Introducing Trail Shoe, our new Outdoor! 👋\n\nKey Features:\n- 😊 Waterproof\n- 👋 Light\n\n"
+        "🤗 Special Features: Recycled sole\n\n💕 Perfect for hikers!\n\n#NewProduct #MustHave #OutdoorLife #TrailShoeLaunch #Innovation",
+    ),
+    (dict(platform="twitter", tone="formal", include_emojis=False), "Introducing our new product!    #New"),
+    (
+        dict(platform="TikTok", tone=None, product_name="Zip {x}", product_category="Gear", key_features=["a"], target_audience="kids", include_hashtags=False),
+        "Check out the new Zip {x}! 🤩\nKey Features:\n- ✨ a\n\n",
+    ),
+])
+def test_render_social_output_is_unchanged(request_fields, expected):
+    assert render_social(social_request(**request_fields)) == expected
+
+
+def test_twitter_posts_are_truncated():
+    content = render_social(social_request(platform="twitter", key_features=["x" * 300]))
+    assert len(content) == 280 and content.endswith("...")
+
+
+def test_format_specs_are_rejected():
+    with pytest.raises(ValueError):
+        parse_template("{price:.2f}")
+
+
+@pytest.mark.asyncio
+async def test_pre_rendered_fallback_is_counted_only_when_used():
+    cached_request = SocialContentRequest(content_title="cached", platform="twitter", product_name="Cached")
+    fresh_request = SocialContentRequest(content_title="fresh", platform="twitter", product_name="Fresh")
+    await get_response_cache().set("social", build_social_cache_key(cached_request), "cached text")
+    counted = fallbacks.labels("social").value
+
+    assert await generate_social_content(cached_request, fallback_content="fallback") == "cached text"
+    assert fallbacks.labels("social").value == counted
+    assert await generate_social_content(fresh_request, fallback_content="fallback") == "fallback"
+    assert fallbacks.labels("social").value == counted + 1
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+
+from src.content_creation.utils.hedging import LatencyTracker, hedged_race
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_slower_attempt_is_cancelled():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "slow"
+
+    async def fast():
+        return "fast"
+
+    started = time.monotonic()
+    assert await hedged_race([slow, fast], lambda index: 0.02) == (1, "fast")
+    assert time.monotonic() - started < 1.0
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+
+
+@pytest.mark.asyncio
+async def test_none_delay_waits_for_failure_before_the_next_attempt():
+    events = []
+
+    async def failing():
+        events.append("first started")
+        await asyncio.sleep(0.05)
+        events.append("first failed")
+        raise ConnectionError("down")
+
+    async def second():
+        events.append("second started")
+        return "ok"
+
+    assert await hedged_race([failing, second], lambda index: None) == (1, "ok")
+    assert events == ["first started", "first failed", "second started"]
+
+
+@pytest.mark.asyncio
+async def test_none_delay_never_hedges_a_slow_success():
+    calls = []
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "slow"
+
+    async def unused():
+        calls.append("unused")
+        return "unused"
+
+    assert await hedged_race([slow, unused], lambda index: None) == (0, "slow")
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_all_attempts_failing_raises_the_last_error():
+    def failing(message, delay):
+        async def attempt():
+            await asyncio.sleep(delay)
+            raise ConnectionError(message)
+        return attempt
+
+    with pytest.raises(ConnectionError, match="third"):
+        await hedged_race([failing("first", 0.01), failing("second", 0.02), failing("third", 0.03)], lambda index: None)
+
+
+@pytest.mark.asyncio
+async def test_discard_receives_the_losing_success():
+    discarded = []
+    gate = asyncio.Event()
+
+    def attempt(result):
+        async def run():
+            await gate.wait()
+            return result
+        return run
+
+    # Both attempts are in flight and succeed in the same loop iteration
+    asyncio.get_running_loop().call_later(0.02, gate.set)
+    winner = await hedged_race([attempt("first"), attempt("second")], lambda index: 0.0, discard=discarded.append)
+    assert winner == (0, "first")
+    assert discarded == ["second"]
+
+
+@pytest.mark.asyncio
+async def test_no_attempts():
+    with pytest.raises(ValueError):
+        await hedged_race([], lambda index: None)
+
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile("a", 0.5) is None
+    for seconds in range(1, 21):
+        tracker.record("a", float(seconds))
+    # Only the last 10 samples are kept
+    assert tracker.percentile("a", 0.0) == 11.0
+    assert tracker.percentile("a", 0.95) == 20.0
+    assert tracker.percentile("a", 0.5, min_samples=11) is None
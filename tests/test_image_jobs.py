@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from src.content_creation.utils.image_jobs import FAILED, SUCCEEDED, ImageJobManager
+
+
+def make_manager(db_path=None) -> ImageJobManager:
+    return ImageJobManager(worker_count=1, queue_size=10, max_finished=10, finished_ttl=60.0, db_path=db_path, poll_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_job_is_visible_from_another_worker_process(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite")
+    # Two managers on one database stand in for two uvicorn workers
+    accepting, polling = make_manager(db_path), make_manager(db_path)
+    await accepting.start()
+    await polling.start()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "/static/images/generated/image.png"
+
+    try:
+        job = await accepting.submit("a prompt", work)
+        state = await polling.get(job.id)
+        assert state["id"] == job.id and state["image_prompt"] == "a prompt"
+        assert state["status"] in ("pending", "running")
+
+        waiter = asyncio.create_task(polling.wait(job.id))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        release.set()
+        final = await asyncio.wait_for(waiter, timeout=5.0)
+        assert final["status"] == SUCCEEDED
+        assert final["image_url"] == "/static/images/generated/image.png"
+        assert (await polling.get(job.id))["status"] == SUCCEEDED
+    finally:
+        await accepting.stop()
+        await polling.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_and_unknown_id(tmp_path):
+    manager = make_manager(str(tmp_path / "jobs.sqlite"))
+    await manager.start()
+
+    async def work():
+        raise RuntimeError("upstream down")
+
+    try:
+        job = await manager.submit("a prompt", work)
+        final = await manager.wait(job.id)
+        assert final["status"] == FAILED and final["error"] == "upstream down"
+        assert await manager.get("missing") is None
+        assert await manager.wait("missing") is None
+    finally:
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_beyond_the_limit_are_dropped_from_the_store(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite")
+    manager = ImageJobManager(worker_count=1, queue_size=10, max_finished=2, finished_ttl=60.0, db_path=db_path)
+    other = make_manager(db_path)
+    await manager.start()
+    await other.start()
+
+    async def work():
+        return "/image.png"
+
+    try:
+        jobs = [await manager.submit(f"prompt {n}", work) for n in range(4)]
+        # The other manager only sees a job as finished once its final state is saved
+        for job in jobs[2:]:
+            assert (await asyncio.wait_for(other.wait(job.id), timeout=5.0))["status"] == SUCCEEDED
+        assert [await other.get(job.id) is not None for job in jobs] == [False, False, True, True]
+    finally:
+        await manager.stop()
+        await other.stop()
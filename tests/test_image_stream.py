@@ -0,0 +1,76 @@
+import base64
+import json
+import os
+import random
+
+import httpx
+import pytest
+
+from src.content_creation.utils.image_stream import Base64ArtifactDecoder, stream_image_to_file
+
+
+def artifact_body(data: bytes, escape_slashes: bool = False) -> bytes:
+    body = json.dumps({"artifacts": [{"base64": base64.b64encode(data).decode(), "seed": 1, "finishReason": "SUCCESS"}]})
+    if escape_slashes:
+        body = body.replace("/", "\\/")
+    return body.encode()
+
+
+def decode_in_chunks(body: bytes, rnd: random.Random) -> bytes:
+    decoder = Base64ArtifactDecoder()
+    out = []
+    position = 0
+    while position < len(body):
+        size = rnd.randint(1, 64)
+        out.append(decoder.feed(body[position:position + size]))
+        position += size
+    assert decoder.done
+    return b"".join(out)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_decodes_any_chunking(seed):
+    rnd = random.Random(seed)
+    data = os.urandom(rnd.randint(1, 3000))
+    assert decode_in_chunks(artifact_body(data, escape_slashes=seed % 2 == 1), rnd) == data
+
+
+def test_key_split_across_chunks():
+    data = os.urandom(100)
+    body = artifact_body(data)
+    split = body.index(b'"base64"') + 3
+    decoder = Base64ArtifactDecoder()
+    assert decoder.feed(body[:split]) + decoder.feed(body[split:]) == data
+
+
+def test_malformed_value_raises():
+    decoder = Base64ArtifactDecoder()
+    with pytest.raises(ValueError):
+        decoder.feed(b'{"base64": 12}')
+
+
+def make_response(body: bytes, content_type: str = "application/json") -> httpx.Response:
+    return httpx.Response(200, headers={"Content-Type": content_type}, content=body)
+
+
+@pytest.mark.asyncio
+async def test_stream_image_to_file(tmp_path):
+    data = os.urandom(50_000)
+    tmp = tmp_path / "image.tmp"
+    assert await stream_image_to_file(make_response(artifact_body(data)), tmp) == tmp
+    assert tmp.read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_stream_image_to_file_removes_temp_file_on_error(tmp_path):
+    tmp = tmp_path / "image.tmp"
+    with pytest.raises(ValueError):
+        await stream_image_to_file(make_response(b'{"artifacts": []}'), tmp)
+    assert not tmp.exists()
+
+
+@pytest.mark.asyncio
+async def test_non_json_body_is_saved_as_is(tmp_path):
+    tmp = tmp_path / "image.tmp"
+    await stream_image_to_file(make_response(b"\x89PNG raw", "image/png"), tmp)
+    assert tmp.read_bytes() == b"\x89PNG raw"
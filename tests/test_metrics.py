@@ -0,0 +1,38 @@
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.content_creation.utils.metrics import record_upstream, route_label, upstream_errors, upstream_request_duration
+
+
+def test_record_upstream_labels_by_endpoint():
+    record_upstream("gemini", "models/test-model", 0.2)
+    record_upstream("stability", "https://stability.test/v1/generate", 1.5, TimeoutError())
+
+    durations = "\n".join(upstream_request_duration.expose())
+    assert 'upstream="gemini",endpoint="models/test-model",outcome="success"' in durations
+    assert 'upstream="stability",endpoint="https://stability.test/v1/generate",outcome="error"' in durations
+    errors = "\n".join(upstream_errors.expose())
+    assert 'upstream_errors_total{upstream="stability",endpoint="https://stability.test/v1/generate",error="TimeoutError"} 1' in errors
+
+
+def test_route_label_is_the_prefixed_route_template():
+    router = APIRouter()
+    labels = []
+
+    @router.get("/files/{name:path}")
+    async def get_file(name: str, request: Request):
+        labels.append(route_label(request.scope))
+        return {}
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: str, request: Request):
+        labels.append(route_label(request.scope))
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    client = TestClient(app)
+    for path in ("/api/files/a/b/c.png", "/api/files/d.png", "/api/files/x/files/y", "/api/items/1", "/api/items/2"):
+        assert client.get(path).status_code == 200
+    assert labels == ["/api/files/{name:path}"] * 3 + ["/api/items/{item_id}"] * 2
+    assert route_label({"path": "/nowhere"}) == "<unmatched>"
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from src.content_creation.utils.exceptions import RateLimitExceededError
+from src.content_creation.utils.rate_limiter import BULK, INTERACTIVE, AdaptiveRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_unlimited_when_budgets_are_zero():
+    limiter = AdaptiveRateLimiter("test", requests_per_minute=0)
+    for _ in range(100):
+        await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_burst_then_queue_deadline():
+    # 60 per minute with a one-second burst: one call now, the next after ~1s
+    limiter = AdaptiveRateLimiter("test", requests_per_minute=60, burst_seconds=1.0, deadlines={INTERACTIVE: 0.05, BULK: 0.05})
+    await limiter.acquire()
+    with pytest.raises(RateLimitExceededError):
+        await limiter.acquire()
+    assert limiter.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_interactive_served_before_bulk():
+    limiter = AdaptiveRateLimiter("test", requests_per_minute=1200, burst_seconds=0.05, deadlines={INTERACTIVE: 5.0, BULK: 5.0})
+    await limiter.acquire()  # Drain the burst
+    order = []
+
+    async def call(lane):
+        await limiter.acquire(priority=lane)
+        order.append(lane)
+
+    bulk = asyncio.create_task(call(BULK))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(call(INTERACTIVE))
+    await asyncio.gather(bulk, interactive)
+    assert order == [INTERACTIVE, BULK]
+
+
+def test_penalize_halves_rate_down_to_floor():
+    limiter = AdaptiveRateLimiter("test", requests_per_minute=60, min_fraction=0.2, recovery_seconds=3600.0)
+    limiter.penalize()
+    assert limiter.fraction == pytest.approx(0.5, abs=0.01)
+    for _ in range(5):
+        limiter.penalize()
+    assert limiter.fraction == pytest.approx(0.2, abs=0.01)
+    limiter.penalize(retry_after=30.0)
+    assert limiter.status()["paused_for_seconds"] > 29
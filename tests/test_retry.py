@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.content_creation.config.settings import settings
+from src.content_creation.utils.retry import RetryBudget, RetryPolicy, is_retryable, reset_request_retry_budget
+
+
+class StatusError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+def make_policy(max_attempts: int = 3) -> RetryPolicy:
+    return RetryPolicy(max_attempts=max_attempts, base_delay=0.0, max_delay=0.0, max_retry_after=30.0, budget=RetryBudget(ratio=1.0, max_tokens=100.0))
+
+
+def test_is_retryable():
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(StatusError(503))
+    assert not is_retryable(StatusError(400))
+    # Executor timeouts leave the blocked call running, so they are final
+    assert not is_retryable(asyncio.TimeoutError())
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_failures_until_success():
+    reset_request_retry_budget()
+    policy = make_policy()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if len(calls) < 3:
+            raise StatusError(503)
+        return "ok"
+
+    assert await policy.run("test", fn) == "ok"
+    assert len(calls) == 3
+    assert policy.counters["test"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts():
+    reset_request_retry_budget()
+    policy = make_policy(max_attempts=2)
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise StatusError(502)
+
+    with pytest.raises(StatusError):
+        await policy.run("test", fn)
+    assert len(calls) == 2
+    assert policy.counters["test"]["gave_up"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_not_retried():
+    reset_request_retry_budget()
+    policy = make_policy()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await policy.run("test", fn)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_no_retry_past_deadline():
+    reset_request_retry_budget()
+    policy = make_policy()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise StatusError(503)
+
+    with pytest.raises(StatusError):
+        await policy.run("test", fn, deadline=asyncio.get_running_loop().time())
+    assert len(calls) == 1
+    assert policy.counters["test"]["deadline_exceeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_budget_limits_retries():
+    reset_request_retry_budget()
+    policy = make_policy(max_attempts=10)
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise StatusError(503)
+
+    with pytest.raises(StatusError):
+        await policy.run("test", fn)
+    assert len(calls) == settings.RETRY_MAX_PER_REQUEST + 1
+    assert policy.counters["test"]["request_budget_exhausted"] == 1